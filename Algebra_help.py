@@ -5,514 +5,18 @@
 
 # IMPORTS
 import streamlit as st
+from streamlit.report_thread import get_report_ctx
 import numpy as np
 import re
-import random
 import pandas as pd
+from fractions import Fraction
+from algebra_core import check_logic, check_input_equation, diagnose, evaluate_number
+from algebra_core import combine_string, simplify_radical, simplify_fraction, Polynomial, rational_root_multiplicities, classify_roots
+from algebra_core import polynomial_difficulties, solvable_polynomial, practice_equation, quadratic_methods, practice_quadratic
 
 # FUNCTIONS
 
 
-def replace_x(expression,substring,val):
-    # This function replaces 'x' or any specified substring, with the string of a value
-    expression = expression.replace('0'+substring,f'0*{val}')
-    expression = expression.replace('1'+substring,f'1*{val}')
-    expression = expression.replace('2'+substring,f'2*{val}')
-    expression = expression.replace('3'+substring,f'3*{val}')
-    expression = expression.replace('4'+substring,f'4*{val}')
-    expression = expression.replace('5'+substring,f'5*{val}')
-    expression = expression.replace('6'+substring,f'6*{val}')
-    expression = expression.replace('7'+substring,f'7*{val}')
-    expression = expression.replace('8'+substring,f'8*{val}')
-    expression = expression.replace('9'+substring,f'9*{val}')
-    expression = expression.replace('.'+substring,f'*{val}')
-    expression = expression.replace(substring,    f'{val}')   
-    return expression
-
-
-def get_val(expression,val):
-    # This function evaluates an algebraic expression of x (input as string) at a specified value
-    # It calls the function "replace_x" which puts the value (as a string) into the expression,
-    # then evaluates the string
-    if '(' not in expression:
-        # distribution not required
-        expression = replace_x(expression,'x',val)
-        return eval(expression)
-    else:
-        # distribution is required
-        while '(' in expression:
-            start = expression.index('(')
-            end   = expression.index(')')
-            # the part of the expression within the parentheses:
-            mini_exp = expression[(start+1):end]
-            mini_val = get_val(mini_exp,val)
-            with_parens = expression[start:(end+1)]
-            expression = replace_x(expression,with_parens,mini_val)
-        # back to the entire expression
-        expression = replace_x(expression,'x',val)
-        return eval(expression)
-    
-
-
-def check_logic(prior, current):
-    # This function compares two complete equations for logical equivalency
-    #
-    # remove all whitespace - this doesn't matter for checking logical consistency,
-    # but does matter for checking for a solution where one side is just 'x'
-    prior = prior.replace(' ','')
-    current = current.replace(' ','')
-    #
-    # set up an array of test values - equations are all linear so we technically only need 2 test values
-    # I set it to 21 in an abundance of caution, while still keeping the run time efficient
-    check_vals = np.linspace(-10,10,21)
-    # check that both equations are valid equations:
-    chk0, solved, output_str = check_input_equation(prior)
-    if chk0==False:
-        output_str += ' [Error: prior line is not an equation]'
-        return False, solved, output_str
-    elif check_input_equation(current)==False:
-        output_str += ' [Error: new line is not an equation]'
-        return False, solved, output_str
-    else:
-        # split both equations into the left side and right side:
-        prior = prior.split('=')
-        current = current.split('=')
-    # check all test values
-    #
-    # whether or not the test value makes either equation true, the discrepancy should stay the same - 
-    # left - right for the 1st equation should equal left - right for the 2nd equation, so
-    # (old_left - old_right) - (new_left - new_right) should equal zero or have a constant ratio for all test vals.
-    chk_sum = []
-    ratio = []
-    for cv in check_vals:
-        old_left  = get_val(prior[0],cv)
-        old_right = get_val(prior[1],cv)
-        new_left  = get_val(current[0],cv)
-        new_right = get_val(current[1],cv)
-        
-        # print statements for debugging specific cases:
-        #print(f'check_val = {cv}')
-        #print(f'1st eqn: left = {old_left}, right = {old_right}, left - right = {old_left-old_right}')
-        #print(f'2nd eqn: left = {new_left}, right = {new_right}, left - right = {new_left-new_right}')
-        
-        # round after 6 decimal places to prevent computational error from throwing false logical errors
-        # + put in absolute value to account for user switching the left and right sides -- logically allowed.
-        chk0 = np.abs(np.round(np.abs(old_left - old_right) - np.abs(new_left - new_right),6))
-        chk_sum.append(chk0)
-        # have to exclude the solution, if it is in the test set, to avoid dividing by zero:
-        if np.abs(new_left - new_right)>0:
-            ratio0=np.abs(np.round(np.abs(old_left - old_right) / np.abs(new_left - new_right),6))
-            ratio.append(ratio0)
-    # output
-    output_old = output_str # string returned from checking the new equation
-    chk_ratio = np.abs(np.round(max(ratio)-min(ratio),6))
-    if (max(chk_sum)==0) or (chk_ratio==0):
-        output_str = 'That step was correct'
-        # is it solved?
-        # If so, only one character from this string should show up: 'x', exactly once,
-        # and one side or the other should be exactly equal to 'x'
-        operations = '+-*()x'
-        solvedx = sum([1 for c in current[0] if c in operations] + [1 for c in current[1] if c in operations])
-        if (solvedx == 2) and ((current[0][0]=='-') or (current[1][0]=='-')):
-            solvedx = 1
-        if ((current[0]=='x') or (current[1]=='x')) and (solvedx==1):
-            output_str += ', and you solved the equation!'
-            return True, True, output_str
-        elif solved==1:
-            output_str += ' - ' + output_old
-            return True, True, output_str
-        else:
-            output_str += '; keep it up!'
-            return True, False, output_str
-    else:
-        output_str = "That's not quite correct. Try again."
-        return False, False, output_str
-    
-
-
-def check_input_equation(equation):
-    # This function is for when a user chooses to type in a starting equation, 
-    # checks to see if is it valid and of the specified form.
-    
-    # initialize return variables:
-    valid = False
-    solved = False
-    output_str = ''
-    
-    # is it even an equation?
-    num_equal = len([m.start() for m in re.finditer('=', equation)])
-    if num_equal != 1:
-        output_str = 'Sorry, this is not a valid equation; please retype.'
-        return valid, solved, output_str
-    
-    # check both sides now:
-    sides = equation.split('=')
-
-    #left side parentheses check - note that 'finditer' breaks when searching for parentheses, so do a replace first
-    left = sides[0].replace('(','@@@@')
-    left = left.replace(')','%%%%')
-    num_open = len([m.start() for m in re.finditer('@@@@', left)])
-    num_close= len([m.start() for m in re.finditer('%%%%', left)])
-    if num_open != num_close:
-        output_str = 'Your left side appears to have unmatched parentheses; please retype.'
-        return valid, solved, output_str
-    if num_open > 1:
-        output_str = 'Sorry, at this time the app can only handle one distribution per side.'
-        return valid, solved, output_str
-    #right side parentheses check:
-    right = sides[1].replace('(','@@@@')
-    right = right.replace(')','%%%%')
-    num_open = len([m.start() for m in re.finditer('@@@@', right)])
-    num_close= len([m.start() for m in re.finditer('%%%%', right)])
-    if num_open != num_close:
-        output_str = 'Your right side appears to have unmatched parentheses; please retype.'
-        return valid, solved, output_str
-    if num_open > 1:
-        output_str = 'Sorry, at this time the app can only handle one distribution per side.'
-        return valid, solved, output_str
-    
-    # check that the equation uses only 'x':
-    other_variables = 'abcdefghijklmnopqrstuvwyz'
-    other_variables += other_variables.upper()
-    if sum([1 for c in other_variables if c in equation])>0:
-        output_str = 'Please retype your equation using "x" as your variable.'
-        return valid, solved, output_str
-    
-    # if there is no variable, it can still be valid, at the end of the solving process:
-    if 'x' not in equation:
-        left = get_val(sides[0],0)
-        right = get_val(sides[1],0)
-        if  left != right:
-            output_str = 'Your equation does not have a variable, and is false. (no solution)'
-            valid = True
-            solved = True
-            return valid, solved, output_str
-        else: 
-            output_str = 'Your equation does not have a variable, and is true. (infinite solutions)'
-            valid = True
-            solved = True
-            return valid, solved, output_str
-    
-    # if all checks passed:
-    valid = True
-    return valid, solved, output_str
-
-# https://stackoverflow.com/questions/4664850/how-to-find-all-occurrences-of-a-substring
-
-
-
-def make_equation(x_on_both, distribution, combining):
-    
-    # x_on_both is binary, distribution and combining are 0,1,2: 0 = neither side, 1 = one side, 2 = both sides
-    
-    # allowed coefficients:
-    coefs = list(range(1,11))
-    # choose random coefficients from this list:
-    coefs = [random.choice(coefs) for n in range(10)]
-
-    if x_on_both == 1:
-    
-        if combining == 2:
-            if distribution == 2:
-                # distribution and combining on both sides: (1024 cases)
-                # ax + b + c(dx + f) = gx + h + i(jx + k)
-                case = random.choice(list(range(1024)))
-                if case//512       == 0: equation  = f'{coefs[0]}x'
-                else:                    equation  = f' -{coefs[0]}x'
-                if (case%512)//256 == 0: equation += f' +{coefs[1]}'
-                else:                    equation += f' - {coefs[1]}'
-                if (case%256)//128 == 0: equation += f' + {coefs[2]}('
-                else:                    equation += f' - {coefs[2]}('
-                if (case%128)//64  == 0: equation += f'{coefs[3]}x'
-                else:                    equation += f'-{coefs[3]}x'
-                if (case%64)//32   == 0: equation += f' + {coefs[4]}) ='
-                else:                    equation += f' - {coefs[4]}) ='
-                if (case%32)//16   == 0: equation += f' {coefs[5]}x'
-                else:                    equation += f' -{coefs[5]}x'
-                if (case%16)//8    == 0: equation += f' + {coefs[6]}'
-                else:                    equation += f' - {coefs[6]}'
-                if (case%8)//4     == 0: equation += f' + {coefs[7]}('
-                else:                    equation += f' - {coefs[7]}('
-                if (case%4)//2     == 0: equation += f'{coefs[8]}x'
-                else:                    equation += f'-{coefs[8]}x'
-                if case%2          == 0: equation += f' + {coefs[9]})'
-                else:                    equation += f' - {coefs[9]})'
-                
-            elif distribution == 1:
-                # distribution on one side and combining on both sides: (1024 cases)
-                case = random.choice(list(range(1024)))
-                if case//512 == 0:
-                    # ax + b + cx + d = fx + g + h(jx + k)
-                    if (case%512)//256 == 0: equation  = f'{coefs[0]}x'
-                    else:                    equation  = f'-{coefs[0]}x'
-                    if (case%256)//128 == 0: equation += f' + {coefs[1]}'
-                    else:                    equation += f' - {coefs[1]}'
-                    if (case%128)//64  == 0: equation += f' + {coefs[2]}x'
-                    else:                    equation += f' - {coefs[2]}x'
-                    if (case%64)//32   == 0: equation += f' + {coefs[3]} ='
-                    else:                    equation += f' - {coefs[3]} ='
-                    if (case%32)//16   == 0: equation += f' {coefs[4]}x'
-                    else:                    equation += f' -{coefs[4]}x'
-                    if (case%16)//8    == 0: equation += f' + {coefs[5]}'
-                    else:                    equation += f' - {coefs[5]}'
-                    if (case%8)//4     == 0: equation += f' + {coefs[6]}('
-                    else:                    equation += f' - {coefs[6]}('
-                    if (case%4)//2     == 0: equation += f' {coefs[7]}x'
-                    else:                    equation += f' -{coefs[7]}x'
-                    if case%2          == 0: equation += f' + {coefs[8]})'
-                    else:                    equation += f' - {coefs[8]})'   
-                else:
-                    # ax + b + c(dx + f) = gx + h + jx + k    
-                    if (case%512)//256 == 0: equation  = f'{coefs[0]}x'
-                    else:                    equation  = f'-{coefs[0]}x'
-                    if (case%256)//128 == 0: equation += f' + {coefs[1]}'
-                    else:                    equation += f' - {coefs[1]}'
-                    if (case%128)//64  == 0: equation += f' + {coefs[2]}('
-                    else:                    equation += f' - {coefs[2]}('
-                    if (case%64)//32   == 0: equation += f'{coefs[3]}x'
-                    else:                    equation += f'-{coefs[3]}x'
-                    if (case%32)//16   == 0: equation += f' + {coefs[4]}) ='
-                    else:                    equation += f' - {coefs[4]}) ='
-                    if (case%16)//8    == 0: equation += f' {coefs[5]}x'
-                    else:                    equation += f' -{coefs[5]}x'
-                    if (case%8)//4     == 0: equation += f' + {coefs[6]}'
-                    else:                    equation += f' - {coefs[6]}'
-                    if (case%4)//2     == 0: equation += f' + {coefs[7]}x'
-                    else:                    equation += f' - {coefs[7]}x'
-                    if case%2          == 0: equation += f' + {coefs[8]}'
-                    else:                    equation += f' - {coefs[8]}'   
-            else:
-                # no distribution, combining on both sides:
-                # ax + b + cx + d = fx + g + hx + j   (256 cases)
-                case = random.choice(list(range(256)))
-                if case//128 == 0:      equation = f'{coefs[0]}x'
-                else:                   equation = f'-{coefs[0]}x'
-                if (case%128)//64 == 0: equation += f' + {coefs[1]}'
-                else:                   equation += f' - {coefs[1]}'
-                if (case%64)//32  == 0: equation += f' + {coefs[2]}x'
-                else:                   equation += f' - {coefs[2]}x'
-                if (case%32)//16  == 0: equation += f' + {coefs[3]} ='
-                else:                   equation += f' - {coefs[3]} ='
-                if (case%16)//8   == 0: equation += f' {coefs[4]}x'
-                else:                   equation += f' -{coefs[4]}x'
-                if (case%8)//4    == 0: equation += f' + {coefs[5]}'
-                else:                   equation += f' - {coefs[5]}'
-                if (case%4)//2    == 0: equation += f' + {coefs[6]}x'
-                else:                   equation += f' - {coefs[6]}x'
-                if case%2         == 0: equation += f' + {coefs[7]}'
-                else:                   equation += f' - {coefs[7]}'
-
-        elif combining == 1:
-            if distribution == 2:
-                # distribution on both sides and combining on one side (512 cases)
-                case = random.choice(list(range(512)))
-                if case//256 == 0:
-                    # ax + b + c(dx + f) = g(hx + j)
-                    if (case%256)//128 == 0: equation  = f'{coefs[0]}x'
-                    else:                    equation  = f'-{coefs[0]}x'
-                    if (case%128)//64  == 0: equation += f' + {coefs[1]}'
-                    else:                    equation += f' - {coefs[1]}'
-                    if (case%64)//32   == 0: equation += f' + {coefs[2]}('
-                    else:                    equation += f' - {coefs[2]}('
-                    if (case%32)//16   == 0: equation += f'{coefs[3]}x'
-                    else:                    equation += f'-{coefs[3]}x'
-                    if (case%16)//8    == 0: equation += f' + {coefs[4]}) ='
-                    else:                    equation += f' - {coefs[4]}) ='
-                    if (case%8)//4     == 0: equation += f' {coefs[5]}('
-                    else:                    equation += f' -{coefs[5]}('
-                    if (case%4)//2     == 0: equation += f'{coefs[6]}x'
-                    else:                    equation += f'-{coefs[6]}x'
-                    if case%2          == 0: equation += f' + {coefs[7]})'
-                    else:                    equation += f' - {coefs[7]})'
-                else:
-                    # a(bx + c) = dx + f + g(hx + j)  
-                    if (case%256)//128 == 0: equation  = f'{coefs[0]}('
-                    else:                    equation  = f'-{coefs[0]}('
-                    if (case%128)//64  == 0: equation += f'{coefs[1]}x'
-                    else:                    equation += f'-{coefs[1]}x'
-                    if (case%64)//32   == 0: equation += f' + {coefs[2]}) ='
-                    else:                    equation += f' - {coefs[2]}) ='
-                    if (case%32)//16   == 0: equation += f' {coefs[3]}x'
-                    else:                    equation += f' -{coefs[3]}x'
-                    if (case%16)//8    == 0: equation += f' + {coefs[4]}'
-                    else:                    equation += f' - {coefs[4]}'
-                    if (case%8)//4     == 0: equation += f' + {coefs[5]}('
-                    else:                    equation += f' - {coefs[5]}('
-                    if (case%4)//2     == 0: equation += f'{coefs[6]}x'
-                    else:                    equation += f'-{coefs[6]}x'
-                    if case%2          == 0: equation += f' + {coefs[7]})'
-                    else:                    equation += f' - {coefs[7]})'
-
-                    
-            elif distribution == 1:
-                # distribution on one side and combining on one side (512 cases)
-                case = random.choice(list(range(512)))
-                if case//128 == 0:
-                    # ax + b + c(dx + f) = gx + h    
-                    if (case%128)//64== 0: equation  = f'{coefs[0]}x'
-                    else:                  equation  = f'-{coefs[0]}x'
-                    if (case%64)//32 == 0: equation += f' + {coefs[1]}'
-                    else:                  equation += f' - {coefs[1]}'
-                    if (case%32)//16 == 0: equation += f' + {coefs[2]}('
-                    else:                  equation += f' - {coefs[2]}('
-                    if (case%16)//8  == 0: equation += f'{coefs[3]}x'
-                    else:                  equation += f'-{coefs[3]}x'
-                    if (case%8)//4   == 0: equation += f' + {coefs[4]}) ='
-                    else:                  equation += f' - {coefs[4]}) ='
-                    if (case%4)//2   == 0: equation += f' {coefs[5]}x'
-                    else:                  equation += f' -{coefs[5]}x'
-                    if case%2        == 0: equation += f' + {coefs[6]}'
-                    else:                  equation += f' - {coefs[6]}'   
-                elif case//128 == 1:
-                    # ax + b = cx + d + f(gx + h)    
-                    if (case%128)//64== 0: equation  = f'{coefs[0]}x'
-                    else:                  equation  = f'-{coefs[0]}x'
-                    if (case%64)//32 == 0: equation += f' + {coefs[1]} ='
-                    else:                  equation += f' - {coefs[1]} ='
-                    if (case%32)//16 == 0: equation += f'{coefs[2]}x'
-                    else:                  equation += f'-{coefs[2]}x'
-                    if (case%16)//8  == 0: equation += f' + {coefs[3]}'
-                    else:                  equation += f' - {coefs[3]}'
-                    if (case%8)//4   == 0: equation += f' + {coefs[4]}('
-                    else:                  equation += f' - {coefs[4]}('
-                    if (case%4)//2   == 0: equation += f'{coefs[5]}x'
-                    else:                  equation += f'-{coefs[5]}x'
-                    if case%2        == 0: equation += f' + {coefs[6]})'
-                    else:                  equation += f' - {coefs[6]})'
-                elif case//128 == 2:
-                    # ax + b + cx + d = f(gx + h)    
-                    if (case%128)//64== 0: equation  = f'{coefs[0]}x'
-                    else:                  equation  = f'-{coefs[0]}x'
-                    if (case%64)//32 == 0: equation += f'+{coefs[1]}'
-                    else:                  equation += f' - {coefs[1]}'
-                    if (case%32)//16 == 0: equation += f' + {coefs[2]}x'
-                    else:                  equation += f' - {coefs[2]}x'
-                    if (case%16)//8  == 0: equation += f' + {coefs[3]} ='
-                    else:                  equation += f' - {coefs[3]} ='
-                    if (case%8)//4   == 0: equation += f' {coefs[4]}('
-                    else:                  equation += f' -{coefs[4]}('
-                    if (case%4)//2   == 0: equation += f'{coefs[5]}x'
-                    else:                  equation += f'-{coefs[5]}x'
-                    if case%2        == 0: equation += f' + {coefs[6]})'
-                    else:                  equation += f' - {coefs[6]})'
-                else:
-                    # a(bx + c) = dx + f + gx + h    
-                    if (case%128)//64== 0: equation  = f'{coefs[0]}('
-                    else:                  equation  = f'-{coefs[0]}('
-                    if (case%64)//32 == 0: equation += f'{coefs[1]}x'
-                    else:                  equation += f'-{coefs[1]}x'
-                    if (case%32)//16 == 0: equation += f' + {coefs[2]}) ='
-                    else:                  equation += f' - {coefs[2]}) ='
-                    if (case%16)//8  == 0: equation += f' {coefs[3]}x'
-                    else:                  equation += f' -{coefs[3]}x'
-                    if (case%8)//4   == 0: equation += f' + {coefs[4]}'
-                    else:                  equation += f' - {coefs[4]}'
-                    if (case%4)//2   == 0: equation += f' + {coefs[5]}x'
-                    else:                  equation += f' - {coefs[5]}x'
-                    if case%2        == 0: equation += f' + {coefs[6]}'
-                    else:                  equation += f' - {coefs[6]}'
-
-            else:
-                # no distribution, combining on one side:
-                # ax + b = cx + d + fx + g OR ax + b + fx + g = cx + d (128 cases)
-                case = random.choice(list(range(128)))
-                if (case%64)//32 == 0: equation  = f'{coefs[0]}x'               
-                else:                  equation  = f'-{coefs[0]}x'
-                if (case%32)//16 == 0: equation += f' + {coefs[1]}'
-                else:                  equation += f' - {coefs[1]}'
-                if case//64 == 0:
-                    if (case%16)//8 == 0: equation += f' = {coefs[2]}x'
-                    else:                 equation += f' = -{coefs[2]}x'
-                    if (case%8)//4  == 0: equation += f' + {coefs[3]}'
-                    else:                 equation += f' - {coefs[3]}'
-                    if (case%4)//2  == 0: equation += f' + {coefs[4]}x'
-                    else:                 equation += f' - {coefs[4]}x'
-                else:
-                    if (case%16)//8 == 0: equation += f' + {coefs[2]}x'
-                    else:                 equation += f' - {coefs[2]}x'
-                    if (case%8)//4  == 0: equation += f' + {coefs[3]} ='
-                    else:                 equation += f' - {coefs[3]} ='
-                    if (case%4)//2  == 0: equation += f' {coefs[4]}x'
-                    else:                 equation += f' -{coefs[4]}x'
-                if case%2       == 0: equation += f' + {coefs[5]}'
-                else:                 equation += f' - {coefs[5]}'
-    
-        else:
-            if distribution == 2:
-                # distribution on both sides, no combining: c(dx + f) = i(jx + k) (64 cases with + or - coefs)
-                case = random.choice(list(range(64)))
-                if case//32      == 0: equation  = f'{coefs[0]}('
-                else:                  equation  = f'-{coefs[0]}('
-                if (case%32)//16 == 0: equation += f'{coefs[1]}x'
-                else:                  equation += f'-{coefs[1]}x'
-                if (case%16)//8  == 0: equation += f' + {coefs[2]}) ='
-                else:                  equation += f' - {coefs[2]}) ='
-                if (case%8)//4   == 0: equation += f' {coefs[3]}('
-                else:                  equation += f' -{coefs[3]}('
-                if (case%4)//2   == 0: equation += f'{coefs[4]}x'
-                else:                  equation += f'-{coefs[4]}x'
-                if case%2        == 0: equation += f' + {coefs[5]})'
-                else:                  equation += f' - {coefs[5]})'
-            elif distribution == 1:
-                # distribution on one side, no combining:
-                # c(dx + f) = gx + h   OR ax + b = i(jx + k) (64 cases with pos or neg coefs)
-                case = random.choice(list(range(64)))
-                if case//32 == 0:
-                    if (case%32)//16 == 0: equation  = f'{coefs[0]}('
-                    else:                  equation  = f'-{coefs[0]}('
-                    if (case%16)//8  == 0: equation += f'{coefs[1]}x'
-                    else:                  equation += f'-{coefs[1]}x'
-                    if (case%8)//4   == 0: equation += f' + {coefs[2]}) ='
-                    else:                  equation += f' - {coefs[2]}) ='
-                    if (case%4)//2   == 0: equation += f' {coefs[3]}x'
-                    else:                  equation += f' -{coefs[3]}x'
-                    if case%2        == 0: equation += f' + {coefs[4]}'
-                    else:                  equation += f' - {coefs[4]}'
-                else:
-                    if (case%32)//16 == 0: equation  = f'{coefs[0]}x'
-                    else:                  equation  = f'-{coefs[0]}x'
-                    if (case%16)//8  == 0: equation += f' + {coefs[1]} ='
-                    else:                  equation += f' - {coefs[1]} ='
-                    if (case%8)//4   == 0: equation += f' {coefs[2]}('
-                    else:                  equation += f' -{coefs[2]}('
-                    if (case%4)//2   == 0: equation += f'{coefs[3]}x'
-                    else:                  equation += f'-{coefs[3]}x'
-                    if case%2        == 0: equation += f' + {coefs[4]})'
-                    else:                  equation += f' - {coefs[4]})'                    
-            else:
-                # no distribution, no combining, but x on both sides: ax+b=cx+d, coefs can be pos or neg (16 cases)
-                case = random.choice(list(range(16)))
-                if case//8 == 0:     equation  = f'{coefs[0]}x'
-                else:                equation  = f'-{coefs[0]}x'
-                if (case%8)//4 == 0: equation += f' + {coefs[1]} ='
-                else:                equation += f' - {coefs[1]} ='
-                if (case%4)//2 == 0: equation += f' {coefs[2]}x'
-                else:                equation += f' -{coefs[2]}x'
-                if case%2      == 0: equation += f' + {coefs[3]}'
-                else:                equation += f' - {coefs[3]}'
-                
-                
-    
-    else:       
-        # x on only one side: ax + b = c OR a = bx + c, and a,b,c can be pos or neg (16 cases)
-        case = random.choice(list(range(16))) 
-        if case//8 == 0:
-                if (case%8)//4 == 0: equation  = f'{coefs[0]}x'
-                else:                equation  = f'-{coefs[0]}x'
-                if (case%4)//2 == 0: equation += f' + {coefs[1]} ='
-                else:                equation += f' - {coefs[1]} ='
-                if case%2      == 0: equation += f' {coefs[2]}'
-                else:                equation += f' -{coefs[2]}'            
-        else:
-                if (case%8)//4 == 0: equation  = f'{coefs[0]} ='
-                else:                equation  = f'-{coefs[0]} ='
-                if (case%4)//2 == 0: equation += f' {coefs[1]}x'
-                else:                equation += f' -{coefs[1]}x'
-                if case%2      == 0: equation += f' + {coefs[2]}'
-                else:                equation += f' - {coefs[2]}'            
-
-    return equation
-    
 def get_example(equation0):
     # This function returns one of five examples to be displayed, depending on the type of linear equation chosen.
     if sum([1 for c in equation0 if c=='x'])==1:
@@ -576,6 +80,14 @@ def get_example(equation0):
                 example_txt.append('x = 8')
     return example_txt
 
+def session_seed():
+    # This function returns a starting seed for the practice equations that stays the same for the whole browser session
+    # (streamlit 0.80 has no session_state), so reruns keep the equation but a new session gets a new one
+    ctx = get_report_ctx()
+    if ctx is None: # not running in streamlit
+        return 0
+    return int(ctx.session_id.replace('-', ''), 16) % 10**6
+
 def get_equation():
     # This function is called to get the equation the student wants to practice (linear equations)
     equation0 = 'Unknown; please select an equation'
@@ -615,150 +127,43 @@ def get_equation():
             x_onboth = 0
             distr = 0
             comb = 0
-        # get the equation:
-        equation0 = make_equation(x_onboth, distr, comb)
+        in4 = st.sidebar.selectbox('Solution:',['Any', 'Whole number only'])
+        if in4 == 'Whole number only': max_denom = 1
+        else: max_denom = None
+        # get the equation: the same seed and options always give the same equation, so it does not change when
+        # streamlit reruns the script, and a new session starts with a different seed
+        seed = st.sidebar.number_input('Practice seed:', min_value=0, value=session_seed(), step=1)
+        equation0, solution0 = practice_equation(int(seed), x_onboth, distr, comb, max_denom)
         st.sidebar.write(equation0)
-        st.sidebar.write('Unfortunately streamlit completely refreshes at every step. To use this equation,')
-        st.sidebar.write('please copy it, select "Type in an equation" above, and paste it in.')
-        st.sidebar.write('If you want a different equation, hit refresh or change your options above.')
+        st.sidebar.write('To use this equation, please copy it, select "Type in an equation" above, and paste it in.')
+        st.sidebar.write('If you want a different equation, change the seed or your options above.')
+        st.sidebar.write('The same seed and options always give this same equation again.')
         valid = True
 
     return equation0,in0
-    
-def diagnose(equation):
-    # This function returns a hint based on the type of equation, if the student missed a step
-    if sum([1 for c in equation if c=='x'])==1: # if there is only one x
-        diagnosis = 'Try adding or subtracting, and then dividing.'
-    else:
-        if sum([1 for c in equation if c=='('])>0: # there is distribution
-            if sum([1 for c in equation if c=='x'])>2: # there is combining like terms
-                diagnosis = 'Try distributing, then combining like terms.'
-            else: # there is no combining like terms, but there is still distribution
-                diagnosis = 'Try distributing.'
-        else: # there is no distribution
-            if sum([1 for c in equation if c=='x'])>2: # there is combining like terms
-                diagnosis = 'Try combining like terms.'
-            else: # no distribution and no combining like terms
-                diagnosis = 'Try adding or subtracting, and then dividing.'
-    return diagnosis
-
-def decimal_to_fraction(chk):
-    # This function returns a simplified fraction for an input decimal value
-    num_range = list(range(1,201))
-    nums = [n for n in num_range for d in num_range]
-    dens = [d for n in num_range for d in num_range]
-    decimals= [n/d for n in num_range for d in num_range]
-    selected = [j for j,c in enumerate(decimals) if np.round(np.abs(chk-c),6)==0]
-    if len(selected)<1:
-        return None, None
-    else:
-        m = selected[0]
-        numer = nums[m]
-        denom = dens[m]        
-        return numer, denom
 
-def combine_string(start):
-    
-    # takes in a string that might be something like "-2 + 3/4", evaluates it and turns it back into a fraction if needed.
-    
-    chk = eval(start) # get the numerical value of the string
-    if chk<0: # negative
-        sign = -1
-        chk = np.abs(chk)
-    else: # positive
-        sign = 1
-    numer, denom = decimal_to_fraction(chk) # get it as a fraction
-    numer = sign*numer
-    
-    if denom!=1: # if it is actually a fraction
-        if numer<denom:
-            new_string = f'{numer}/{denom}' # fraction
+def degree_name(degree):
+    # This function returns the name of a polynomial degree, for the messages in the polynomial section
+    names = {2: 'quadratic', 3: 'cubic', 4: 'quartic', 5: 'quintic', 6: 'sextic'}
+    return names.get(degree, f'degree {degree}')
+
+def ordinal(n):
+    # 1 --> '1st', 2 --> '2nd', ... for labelling the blanks
+    if n%100 in [11, 12, 13]:
+        return f'{n}th'
+    return f'{n}' + {1: 'st', 2: 'nd', 3: 'rd'}.get(n%10, 'th')
+
+def synthetic_division_table(poly, root):
+    # This function makes the synthetic division table for dividing poly by (x - root): the root and the coefficients
+    # along the top, with a blank [  ] under each coefficient for the student to fill in (except the last, the remainder)
+    sdiv_df = pd.DataFrame({'0': [f'{root} __|', '', '', '']})
+    for k, c in enumerate(poly.coefs):
+        if k < poly.degree:
+            sdiv_df[' '*k] = [int(c), '', '---', '[  ]']
         else:
-            new_string = f'{numer//denom} {numer%denom}/{denom}' # improper fraction changed to a mixed number
-    else: # if it is a whole number
-        new_string = f'{numer}'
-    
-    return new_string
-
-   
-def simplify_radical(start):
-    # This function takes in a number from under a square root, and simplifes the radical
-    # for instance simplify_radical(20) --> 2,5,1, because sqrt(20) = 2 sqrt(5) / 1
-    # simplify_radical(8/5) --> 2,10,5, because sqrt(8/5) = sqrt(40/25) = 2 sqrt(10)/5
-    
-    # get list of perfect squares to check against, largest first
-    perf_squares = [c*c for c in list(range(100,0,-1))]
-    num_range = list(range(1,201))
-    
-    chk = start%1
-    
-    if chk != 0: # decimal value -- convert remainder to fraction
-        chk, start_denom = decimal_to_fraction(chk)
-        if chk==None:
-            return None, None, None
-    else:
-        start_denom = 1
-    
-    start_num = (start//1)*start_denom + chk # complete fraction
-        
-    if start_denom not in perf_squares: # make there be a perfect square in the denominator, to avoid radicals in the denominator
-        start_num = start_num*start_denom
-        start_denom = start_denom*start_denom
-
-    denom = np.round(np.power(start_denom,0.5)) # since the denominator is now a perfect square, take the square root
-    squares = [s for s in perf_squares if start_num%s==0] # find the largest perfect square that is a factor of the numerator
-    in_rad = start_num// squares[0] # what is left in the radical
-    out_rad= np.power(squares[0],0.5) # take the square root of that perfect square out of the radical
-    
-    ## SQRT({start}) = {out_rad}SQRT({in_rad})/{denom}
-    
-    out_rad = int(out_rad)
-    in_rad = int(in_rad)
-    denom = int(denom)
-    out_rad, denom = simplify_fraction(out_rad,denom) # simplify the fraction outside the radical if needed
-    
-    return out_rad, in_rad, denom
-
-
-def simplify_fraction(n0, d0):
-    
-    # simplifies the fraction n0/d0, if possible
-    
-    chk = n0/d0
-    sign = (chk/np.abs(chk))
-    n0 = np.abs(n0)
-    d0 = np.abs(d0)
-    
-    m = max([n0, d0])
-    common_factors = [j for j in range(2,(m+1)) if (n0%j==0) and (d0%j==0)]
-    if len(common_factors)<1: # no common factors, cannot be simplified, leave it alone
-        n1 = int(sign*n0)
-        d1 = d0
-    else: # at least one common factor > 1, divide numerator and denominator by the greatest common factor
-        gcf = max(common_factors)
-        n1 = int(sign*n0/gcf)
-        d1 = int(d0/gcf)
-    
-    return n1, d1
-
-def synthetic_division(c5,c4,c3,c2,c1,c0,r):
-    # returns the coeficients ot the result of doing synthetic division on {c5}x^5+{c4}x^4+{c3}x^3+{c2}x^2+{c1}x+{c0} by x-r for root r
-    b5 = int(c5)
-    b4 = int(c4 + b5*r)
-    b3 = int(c3 + b4*r)
-    b2 = int(c2 + b3*r)
-    b1 = int(c1 + b2*r)
-    b0 = int(c0 + b1*r)
-    if r%1!=0:
-        n,d = decimal_to_fraction(r)
-        b5 = int(b5/d)
-        b4 = int(b4/d)
-        b3 = int(b3/d)
-        b2 = int(b2/d)
-        b1 = int(b1/d)
-        b0 = int(b0/d)
-    return b5, b4, b3, b2, b1, b0
-    # result is {b5}x^4 + {b4}x^3 + {b3}x^2 + {b2}x + {b1} + {b0}/(x-r)
+            sdiv_df[' '*k] = [int(c), '', '---', '']
+    sdiv_df.set_index('0',inplace=True)
+    return sdiv_df
     
 # APP CODE:
 
@@ -783,200 +188,35 @@ if eqn_type == 'Linear Equations':
     equation0,in0 = get_equation()
     if in0=='Type in an equation':
 
-        # first step:
-        cnt = 1
-        message0 = f'[{cnt-1}]: the equation is:  ' + equation0
-        st.write(message0)
-        message1 = f'Please type the equation after step {cnt}: '
-        line1 = st.text_input(message1, value=equation0)
-        if line1 != equation0:
-            valid, solved, output = check_logic(equation0, line1)
+        # one step per pass through the loop, with no limit on the number of steps.
+        # steps holds the equation and every line the student has entered and had checked so far;
+        # the text boxes are keyed by step number and keep their values across reruns, and earlier verdicts come
+        # from the check_logic cache, so each rerun only really checks the newest line. A box starts out holding the
+        # line before it, so changing an earlier line starts the boxes after it again from the new line.
+        steps = [equation0]
+        while True:
+            cnt = len(steps)
+            line1 = steps[-1]
+            message0 = f'[{cnt-1}]: the equation is:  ' + line1
+            st.write(message0)
+            message1 = f'Please type the equation after step {cnt}: '
+            linenew = st.text_input(message1, value=line1, key=f'step{cnt}')
+            if linenew == line1: # nothing new typed in yet
+                break
+            valid, solved, output = check_logic(line1, linenew)
             if valid == 0: # logic error
-                diagnosis = diagnose(equation0)
+                diagnosis = diagnose(line1)
                 st.write(output + ' ' + diagnosis)
-            else:
-                if solved == 1: # solved it!
-                    st.write('Great job!')
-                    st.write(output)
-                    st.balloons()
-                else: # need to continue
-                    st.write(output)
-
-                    cnt += 1 # 2ND STEP
-                    message0 = f'[{cnt-1}]: the equation is:  ' + line1
-                    st.write(message0)
-                    message1 = f'Please type the equation after step {cnt}: '
-                    linenew = st.text_input(message1, value=line1)
-                    if linenew != line1:
-                        valid, solved, output = check_logic(line1, linenew)
-                        if valid == 0: # logic error
-                            diagnosis = diagnose(line1)
-                            st.write(output + ' ' + diagnosis)
-                        else: # valid, check for solved
-                            if solved == 1: # solved it!
-                                st.write('Great job!')
-                                st.write(output)
-                                st.balloons()
-                            else: # need to continue
-                                st.write(output)
-                                line1 = linenew
-
-                                cnt += 1 # 3RD STEP
-                                message0 = f'[{cnt-1}]: the equation is:  ' + line1
-                                st.write(message0)
-                                message1 = f'Please type the equation after step {cnt}: '
-                                linenew = st.text_input(message1, value=line1)
-                                if linenew != line1:
-                                    valid, solved, output = check_logic(line1, linenew)
-                                    if valid == 0: # logic error
-                                        diagnosis = diagnose(line1)
-                                        st.write(output + ' ' + diagnosis)
-                                    else: # valid, check for solved
-                                        if solved == 1: # solved it!
-                                            st.write('Great job!')
-                                            st.write(output)
-                                            st.balloons()
-                                        else: # need to continue
-                                            st.write(output)
-                                            line1 = linenew
-
-                                            cnt += 1 # 4TH STEP
-                                            message0 = f'[{cnt-1}]: the equation is:  ' + line1
-                                            st.write(message0)
-                                            message1 = f'Please type the equation after step {cnt}: '
-                                            linenew = st.text_input(message1, value=line1)
-                                            if linenew != line1:
-                                                valid, solved, output = check_logic(line1, linenew)
-                                                if valid == 0: # logic error
-                                                    diagnosis = diagnose(line1)
-                                                    st.write(output + ' ' + diagnosis)
-                                                else: # valid, check for solved
-                                                    if solved == 1: # solved it!
-                                                        st.write('Great job!')
-                                                        st.write(output)
-                                                        st.balloons()
-                                                    else: # need to continue
-                                                        st.write(output)
-                                                        line1 = linenew
-
-                                                        cnt += 1 # 5TH STEP
-                                                        message0 = f'[{cnt-1}]: the equation is:  ' + line1
-                                                        st.write(message0)
-                                                        message1 = f'Please type the equation after step {cnt}: '
-                                                        linenew = st.text_input(message1, value=line1)
-                                                        if linenew != line1:
-                                                            valid, solved, output = check_logic(line1, linenew)
-                                                            if valid == 0: # logic error
-                                                                diagnosis = diagnose(line1)
-                                                                st.write(output + ' ' + diagnosis)
-                                                            else: # valid, check for solved
-                                                                if solved == 1: # solved it!
-                                                                    st.write('Great job!')
-                                                                    st.write(output)
-                                                                    st.balloons()
-                                                                else: # need to continue
-                                                                    st.write(output)
-                                                                    line1 = linenew
-
-                                                                    cnt += 1 # 6TH STEP
-                                                                    message0 = f'[{cnt-1}]: the equation is:  ' + line1
-                                                                    st.write(message0)
-                                                                    message1 = f'Please type the equation after step {cnt}: '
-                                                                    linenew = st.text_input(message1, value=line1)
-                                                                    if linenew != line1:
-                                                                        valid, solved, output = check_logic(line1, linenew)
-                                                                        if valid == 0: # logic error
-                                                                            diagnosis = diagnose(line1)
-                                                                            st.write(output + ' ' + diagnosis)
-                                                                        else: # valid, check for solved
-                                                                            if solved == 1: # solved it!
-                                                                                st.write('Great job!')
-                                                                                st.write(output)
-                                                                                st.balloons()
-                                                                            else: # need to continue
-                                                                                st.write(output)
-                                                                                line1 = linenew
-
-                                                                                cnt += 1 # 7TH STEP
-                                                                                message0 = f'[{cnt-1}]: the equation is:  ' + line1
-                                                                                st.write(message0)
-                                                                                message1 = f'Please type the equation after step {cnt}: '
-                                                                                linenew = st.text_input(message1, value=line1)
-                                                                                if linenew != line1:
-                                                                                    valid, solved, output = check_logic(line1, linenew)
-                                                                                    if valid == 0: # logic error
-                                                                                        diagnosis = diagnose(line1)
-                                                                                        st.write(output + ' ' + diagnosis)
-                                                                                    else: # valid, check for solved
-                                                                                        if solved == 1: # solved it!
-                                                                                            st.write('Great job!')
-                                                                                            st.write(output)
-                                                                                            st.balloons()
-                                                                                        else: # need to continue
-                                                                                            st.write(output)
-                                                                                            line1 = linenew
-
-                                                                                            cnt += 1 # 8TH STEP
-                                                                                            message0 = f'[{cnt-1}]: the equation is:  ' + line1
-                                                                                            st.write(message0)
-                                                                                            message1 = f'Please type the equation after step {cnt}: '
-                                                                                            linenew = st.text_input(message1, value=line1)
-                                                                                            if linenew != line1:
-                                                                                                valid, solved, output = check_logic(line1, linenew)
-                                                                                                if valid == 0: # logic error
-                                                                                                    diagnosis = diagnose(line1)
-                                                                                                    st.write(output + ' ' + diagnosis)
-                                                                                                else: # valid, check for solved
-                                                                                                    if solved == 1: # solved it!
-                                                                                                        st.write('Great job!')
-                                                                                                        st.write(output)
-                                                                                                        st.balloons()
-                                                                                                    else: # need to continue
-                                                                                                        st.write(output)
-                                                                                                        line1 = linenew
-
-                                                                                                        cnt += 1 # 9TH STEP
-                                                                                                        message0 = f'[{cnt-1}]: the equation is:  ' + line1
-                                                                                                        st.write(message0)
-                                                                                                        message1 = f'Please type the equation after step {cnt}: '
-                                                                                                        linenew = st.text_input(message1, value=line1)
-                                                                                                        if linenew != line1:
-                                                                                                            valid, solved, output = check_logic(line1, linenew)
-                                                                                                            if valid == 0: # logic error
-                                                                                                                diagnosis = diagnose(line1)
-                                                                                                                st.write(output + ' ' + diagnosis)
-                                                                                                            else: # valid, check for solved
-                                                                                                                if solved == 1: # solved it!
-                                                                                                                    st.write('Great job!')
-                                                                                                                    st.write(output)
-                                                                                                                    st.balloons()
-                                                                                                                else: # need to continue
-                                                                                                                    st.write(output)
-                                                                                                                    line1 = linenew
-
-                                                                                                                    cnt += 1 # 10TH STEP
-                                                                                                                    message0 = f'[{cnt-1}]: the equation is:  ' + line1
-                                                                                                                    st.write(message0)
-                                                                                                                    message1 = f'Please type the equation after step {cnt}: '
-                                                                                                                    linenew = st.text_input(message1, value=line1)
-                                                                                                                    if linenew != line1:
-                                                                                                                        valid, solved, output = check_logic(line1, linenew)
-                                                                                                                        if valid == 0: # logic error
-                                                                                                                            diagnosis = diagnose(line1)
-                                                                                                                            st.write(output + ' ' + diagnosis)
-                                                                                                                        else: # valid, check for solved
-                                                                                                                            if solved == 1: # solved it!
-                                                                                                                                st.write('Great job!')
-                                                                                                                                st.write(output)
-                                                                                                                                st.balloons()
-                                                                                                                            else: # need to continue, but stuck
-                                                                                                                                st.write(output)
-                                                                                                                                line1 = linenew
-
-                                                                                                                                st.write('You seem to be having trouble.')
-                                                                                                                                st.write('This problem should not take this many steps -- go back up and check your work.')
-
-                                                                                                                                
+                break
+            if solved == 1: # solved it!
+                st.write('Great job!')
+                st.write(output)
+                st.balloons()
+                break
+            # need to continue
+            st.write(output)
+            steps.append(linenew)
+
 ############################################### QUADRATIC EQUATIONS SECTION ###############################################
 
 elif eqn_type == 'Quadratic Equations':
@@ -987,9 +227,20 @@ elif eqn_type == 'Quadratic Equations':
     if Q1 == 'Standard':
         coef_options  = list(range(-10,11))
         coef_options2 = list(range(-20,21))
-        a = st.sidebar.selectbox('Enter "a" (the quadratic coefficient):',coef_options)
-        b = st.sidebar.selectbox('Enter "b" (the linear coefficient):',coef_options)
-        c = st.sidebar.selectbox('Enter "c" (the constant term):',coef_options2)
+        method_options = list(quadratic_methods)
+        pick = st.sidebar.selectbox('How do you want to get the equation?',['Choose a, b and c', 'Give me one for a method'])
+        if pick == 'Give me one for a method':
+            # looked up in the index of equations tagged by which methods suit them (algebra_core)
+            method = st.sidebar.selectbox('Method:',method_options)
+            number = st.sidebar.number_input('Equation number:', min_value=1, value=1, step=1)
+            st.sidebar.write('Change the equation number to get a different equation.')
+            a, b, c = practice_quadratic(method, int(number))
+            method_index = method_options.index(method)
+        else:
+            a = st.sidebar.selectbox('Enter "a" (the quadratic coefficient):',coef_options)
+            b = st.sidebar.selectbox('Enter "b" (the linear coefficient):',coef_options)
+            c = st.sidebar.selectbox('Enter "c" (the constant term):',coef_options2)
+            method_index = 0
         if a == 1:
             disp_a = 'x^2'
         else:
@@ -997,7 +248,7 @@ elif eqn_type == 'Quadratic Equations':
         equation0 = disp_a + f' + {b}x + {c} = 0'
         st.latex(equation0)
         
-        slv_mthd = st.selectbox('Which method would you like to practice?', ['Factoring', 'Completing the square', 'Quadratic Formula'])
+        slv_mthd = st.selectbox('Which method would you like to practice?', method_options, index=method_index)
         
         if slv_mthd == 'Factoring':
         ############################################### SOLVE BY FACTORING ###############################################
@@ -2471,612 +1722,94 @@ elif eqn_type == 'Quadratic Equations':
 
 elif eqn_type == 'Polynomial Equations':
     chk3 = False
-    degree = st.sidebar.selectbox('What degree?',['Cubic (x^3)', 'Quartic (x^4)', 'Quintic (x^5)'])
-    coef_options = list(range(-40,41))
-    if degree == 'Quintic (x^5)':
-        c5 = st.sidebar.selectbox('Enter the x^5 coefficient:',['SELECT']+coef_options)
-        c4 = st.sidebar.selectbox('Enter the x^4 coefficient:',['SELECT']+coef_options)
-    elif degree == 'Quartic (x^4)':
-        c5 = 0
-        c4 = st.sidebar.selectbox('Enter the x^4 coefficient:',['SELECT']+coef_options)
+    degree_options = ['Cubic (x^3)', 'Quartic (x^4)', 'Quintic (x^5)', 'Sextic (x^6)']
+    degree = st.sidebar.selectbox('What degree?',degree_options)
+    n = degree_options.index(degree) + 3
+    pick = st.sidebar.selectbox('How do you want to get the equation?',['Choose the coefficients', 'Give me a solvable equation'])
+    if pick == 'Give me a solvable equation':
+        # a polynomial built from its roots, so it always has enough rational roots (from the index in algebra_core)
+        level = st.sidebar.selectbox('Difficulty:',list(polynomial_difficulties.values()))
+        difficulty = list(polynomial_difficulties.values()).index(level) + 1
+        number = st.sidebar.number_input('Equation number:', min_value=1, value=1, step=1)
+        st.sidebar.write('Change the equation number to get a different equation.')
+        coefs = solvable_polynomial(n, difficulty, int(number))
     else:
-        c5 = 0
-        c4 = 0
-    c3 = st.sidebar.selectbox('Enter the x^3 coefficient:',['SELECT']+coef_options)
-    c2 = st.sidebar.selectbox('Enter the x^2 coefficient):',['SELECT']+coef_options)
-    c1 = st.sidebar.selectbox('Enter the linear coefficient:',['SELECT']+coef_options)
-    c0 = st.sidebar.selectbox('Enter the constant:',['SELECT']+coef_options)
-    b4 = c4
-    b3 = c3
-    b2 = c2
-    b1 = c1
-    b0 = c0
-    if (c5!='SELECT') and (c4!='SELECT') and (c3!='SELECT') and (c2!='SELECT') and (c1!='SELECT') and (c0!='SELECT'):
-
-        if c5!=0:
-            equation = f'{c5}x^5 + {c4}x^4 + {c3}x^3 + {c2}x^2 + {c1}x + {c0} = 0'
-            q = np.abs(c5)
-        elif c4!=0:
-            equation = f'{c4}x^4 + {c3}x^3 + {c2}x^2 + {c1}x + {c0} = 0'
-            q = np.abs(c4)
-        else:
-            equation = f'{c3}x^3 + {c2}x^2 + {c1}x + {c0} = 0'
-            q = np.abs(c3)
-        if c0!=0:
-            p = np.abs(c0)
-        elif c1!=0:
-            p = np.abs(c1)
-        elif c2!=0:
-            p = np.abs(c2)
-        elif c3!=0:
-            p = np.abs(c3)
-        elif c4!=0:
-            p = np.abs(c4)
-        else:
-            p = np.abs(c5)
+        coef_options = list(range(-40,41))
+        coef_labels = {2: 'Enter the x^2 coefficient):', 1: 'Enter the linear coefficient:', 0: 'Enter the constant:'}
+        coefs = [st.sidebar.selectbox(coef_labels.get(k, f'Enter the x^{k} coefficient:'),['SELECT']+coef_options) for k in range(n,-1,-1)]
+    if 'SELECT' not in coefs:
+
+        poly = Polynomial(coefs) # a 0 leading coefficient just makes it a lower degree
+        st.latex(f'{poly} = 0')
         # all rational roots of a polynomial equation are in the list +/- [factors of p / factors of q],
-        # where p is the constant term and q is the leading coefficient
-        st.latex(equation)
-        q_list = [j for j in range(1,(q+1)) if q%j==0]
-        p_list = [j for j in range(1,(p+1)) if p%j==0]
-        rat_root_list = [p1/q1 for q1 in q_list for p1 in p_list]
-        rat_root_list += [-1*c for c in rat_root_list]
-        # check all the values in the list of possible rational roots for values that make the polynomial equation true. Those are the roots.
-        roots = [r for r in rat_root_list if np.round(c5*np.power(r,5)+c4*np.power(r,4)+c3*np.power(r,3)+c2*np.power(r,2)+c1*r+c0,6)==0]
-        if c0==0: roots.append(0)
-        ## NEED A CHECK FOR MULTIPLICITY!
-        new_roots = []
-        for r in roots: # check all roots in the list to see it they have multiplicity: e.g., x^3+3x^2+3x+1=0 has a root -1 with m3 because it equals (x+1)^3
-            r5,r4,r3,r2,r1,chk0 = synthetic_division(c5,c4,c3,c2,c1,c0,r)
-            r5,r4,r3,r2,r1,chk1 = synthetic_division(r5,r4,r3,r2,r1,chk0,r)
-            r5,r4,r3,r2,r1,chk2 = synthetic_division(r5,r4,r3,r2,r1,chk1,r)
-            if (chk1==0): 
-                new_roots.append(r) # if chk1==0, then the same root works at least twice -- append another copy of it to the root list
-            if (chk2==0):
-                new_roots.append(r) # if chk2==0, then the same root works at least 3 times -- append a 3rd copy to the list
-        roots = roots + new_roots
+        # where p is the constant term and q is the leading coefficient. rational_roots tries each reduced fraction once
+        # and checks them all at once in exact whole-number arithmetic, so no rounding is needed.
+        # Each root is listed as many times as it goes in: e.g., x^3+3x^2+3x+1=0 has a root -1 with m3 because it equals (x+1)^3,
+        # and deflations[k] is the equation after the first k roots are divided out, for the steps below.
+        multiplicities, deflations = rational_root_multiplicities(poly)
+        roots = [r for r, m in multiplicities for copy in range(m)]
         
         # Do we have enough rational roots to be able to solve the selected equation? If not alert the user to adjust choices.
-        if ((c5!=0) and (len(roots)<3)):
-            st.write('For a quintic equation, you need to have at least 3 rational roots (from the $\pm$ p/q list).')
+        # Each rational root takes the degree down by one, until it is a quadratic.
+        needed = poly.degree - 2
+        if poly.degree < 2:
+            st.write('This equation has no x^2 or higher terms; please change your selections in the sidebar (the leading coefficient cannot be 0).')
+        elif len(roots) < needed:
+            st.write(f'For a {degree_name(poly.degree)} equation, you need to have at least {needed} rational roots (from the $\pm$ p/q list).')
             if len(roots)<1:
                 st.write('This equation has none; please change your selections in the sidebar to get a solvable equation.')
             else:
                 st.write(f'This equation only has {len(roots)}; please change your selections in the sidebar to get a solvable equation.')
-        elif ((c4!=0) and (len(roots)<2)):
-            st.write('For a quartic equation, you need to have at least 2 rational roots (from the $\pm$ p/q list).')
-            if len(roots)<1:
-                st.write('This equation has none; please change your selections in the sidebar to get a solvable equation.')
-            else:
-                st.write(f'This equation only has {len(roots)}; please change your selections in the sidebar to get a solvable equation.')
-        elif (len(roots)<1):
-            st.write('For a cubic equation, you need to have at least 1 rational roots (from the $\pm$ p/q list).')
-            st.write('This equation has none; please change your selections in the sidebar to get a solvable equation.')
+            # tell them which roots it does have (the rational ones exactly, the rest numerically from what is left)
+            rational, irrational, complex_roots = classify_roots(roots, deflations[-1])
+            st.write(f'For reference, here are all {poly.degree} of its roots:')
+            if len(rational)>0:
+                st.write('Rational: ' + ', '.join(f'{r}' for r in rational))
+            if len(irrational)>0:
+                st.write('Irrational (rounded): ' + ', '.join(f'{np.round(r,4)}' for r in irrational))
+            if len(complex_roots)>0:
+                st.write('Complex (rounded): ' + ', '.join(f'{np.round(z.real,4)} {"+" if z.imag>0 else "-"} {np.round(abs(z.imag),4)}i' for z in complex_roots))
         else: # ready to solve
-            
-            if c5!=0: # we have a quintic (degree = 5) equation
-                root = roots[0] # get the first rational root
-                if root%1 == 0: # whole number root
-                    root = int(root)
-                    st.write(f'One rational root is: {root}')
-                    st.write('Use synthetic division to reduce this quintic equation to a quartic:')
-                    sdiv_df = pd.DataFrame({
-                        '0': [f'{root} __|', '', '', ''],
-                        '' : [c5, '', '---', '[  ]'],
-                        ' ' : [c4, '', '---', '[  ]'],
-                        '  ' : [c3, '', '---', '[  ]'],
-                        '   ' : [c2, '', '---', '[  ]'],
-                        '    ' : [c1, '', '---', '[  ]'],
-                        '     ' : [c0, '', '---', ''],
-                    })
-                    sdiv_df.set_index('0',inplace=True)
-                    st.table(sdiv_df)
-                    b4 = c5
-                    b3 = b4*root + c4
-                    b2 = b3*root + c3
-                    b1 = b2*root + c2
-                    b0 = b1*root + c1
-                    b4_in = st.text_input('1st blank',value='') 
-                    b3_in = st.text_input('2nd blank',value='')
-                    b2_in = st.text_input('3rd blank',value='')
-                    b1_in = st.text_input('4th blank',value='')
-                    b0_in = st.text_input('5th blank',value='')
-                    chk5 = False
-                    if (b4_in.isnumeric) and (b3_in.isnumeric) and (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                        b4_in = int(b4_in)
-                        b3_in = int(b3_in)
-                        b2_in = int(b2_in)
-                        b1_in = int(b1_in)
-                        b0_in = int(b0_in)
-                        if (b4_in!=b4) or (b3_in!=b3) or (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                            st.write('Try again.')
-                            chk5 = False
-                        else:
-                            st.write('Nicely done! We now have a quartic equation:')
-                            st.latex(f'{b4}x^4 + {b3}x^3 + {b2}x^2 + {b1}x + {b0} = 0.')
-                            chk5 = True # set flag to indicate we are goot to continue with the quartic
+            chk3 = True # set back to False if a step is not done (correctly) yet
+            for step, root in enumerate(roots[:needed]):
+                if step == 0:
+                    first = 'One'
+                else:
+                    first = 'Another'
+                if root==0: # check for root = 0
+                    poly = deflations[step+1]
+                    st.write(f'{first} rational root is 0. So we can just divide the equation by x:')
+                    st.write(f'We now have a {degree_name(poly.degree)} equation:')
+                    st.latex(f'{poly} = 0.')
+                    continue
+                denom = root.denominator
+                if denom == 1: # whole number root
+                    st.write(f'{first} rational root is: {root}')
+                    st.write(f'Use synthetic division to reduce this {degree_name(poly.degree)} equation to a {degree_name(poly.degree - 1)}:')
                 else: # fraction root
-                    numer, denom = decimal_to_fraction(root)
-                    st.write(f'One rational root is {root}, or {numer}/{denom}.')
-                    st.write('Even though this is a fraction, we can still use synthetic division to reduce this quintic equation to a quartic;')
+                    st.write(f'{first} rational root is {float(root)}, or {root.numerator}/{denom}.')
+                    st.write(f'Even though this is a fraction, we can still use synthetic division to reduce this {degree_name(poly.degree)} equation to a {degree_name(poly.degree - 1)};')
                     st.write(f' we just have to divide by {denom} at the end.')
-                    sdiv_df = pd.DataFrame({
-                        '0': [f'{root} __|', '', '', ''],
-                        '' : [c5, '', '---', '[  ]'],
-                        ' ' : [c4, '', '---', '[  ]'],
-                        '  ' : [c3, '', '---', '[  ]'],
-                        '   ' : [c2, '', '---', '[  ]'],
-                        '    ' : [c1, '', '---', '[  ]'],
-                        '     ' : [c0, '', '---', ''],
-                    })
-                    sdiv_df.set_index('0',inplace=True)
-                    st.table(sdiv_df)
-                    b4 = c5
-                    b3 = b4*root + c4
-                    b2 = b3*root + c3
-                    b1 = b2*root + c2
-                    b0 = b1*root + c1
-                    b4_in = st.text_input('1st blank',value = '')
-                    b3_in = st.text_input('2nd blank',value = '')
-                    b2_in = st.text_input('3rd blank',value = '')
-                    b1_in = st.text_input('4th blank',value = '')
-                    b0_in = st.text_input('5th blank',value = '')
-                    if (b4_in.isnumeric) and (b3_in.isnumeric) and (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                        b4_in = int(b4_in)
-                        b3_in = int(b3_in)
-                        b2_in = int(b2_in)
-                        b1_in = int(b1_in)
-                        b0_in = int(b0_in)
-                        if (b4_in!=b4) or (b3_in!=b3) or (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                            st.write('Try again.')
-                            chk5 = False
-                        else:
-                            b4 = int(b4/denom)
-                            b3 = int(b3/denom)
-                            b2 = int(b2/denom)
-                            b1 = int(b1/denom)
-                            b0 = int(b0/denom)
-                            st.write(f'Nicely done! After dividing those all by {denom}, we have a quartic equation:')
-                            st.latex(f'{b4}x^4 + {b3}x^3 + {b2}x^2 + {b1}x + {b0} = 0.')
-                            chk5 = True # set flag that we are good to continue with the quartic
-                if chk5==True: # continue with the quartic
-                    c4 = b4 # reset coefficients
-                    c3 = b3
-                    c2 = b2
-                    c1 = b1
-                    c0 = b0
-                    root = roots[1] # get the next root
-                    if root==0: # check to see if the root is zero. 
-                        st.write(f'Another rational root is 0. So we can just divide the equation by x:')
-                        b3 = c4
-                        b2 = c3
-                        b1 = c2
-                        b0 = c1
-                        st.write('We now have a cubic equation:')
-                        st.latex(f'{b3}x^3 + {b2}x^2 + {b1}x + {b0} = 0.')
-                        chk4 = True
-                    elif root%1 == 0: # whole number root
-                        root = int(root)
-                        st.write(f'Another rational root is: {root}')
-                        st.write('Use synthetic division to reduce this quartic equation to a cubic:')
-                        sdiv_df = pd.DataFrame({
-                            '0': [f'{root} __|', '', '', ''],
-                            ' ' : [c4, '', '---', '[  ]'],
-                            '  ' : [c3, '', '---', '[  ]'],
-                            '   ' : [c2, '', '---', '[  ]'],
-                            '    ' : [c1, '', '---', '[  ]'],
-                            '     ' : [c0, '', '---', ''],
-                        })
-                        sdiv_df.set_index('0',inplace=True)
-                        st.table(sdiv_df)
-                        b3 = c4
-                        b2 = b3*root + c3
-                        b1 = b2*root + c2
-                        b0 = b1*root + c1
-                        b3_in = st.text_input(' 1st blank',value = '')
-                        b2_in = st.text_input(' 2nd blank',value = '')
-                        b1_in = st.text_input(' 3rd blank',value = '')
-                        b0_in = st.text_input(' 4th blank',value = '')
-                        if (b3_in.isnumeric) and (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                            b3_in = int(b3_in)
-                            b2_in = int(b2_in)
-                            b1_in = int(b1_in)
-                            b0_in = int(b0_in)
-                            if (b3_in!=b3) or (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                st.write('Try again.')
-                                chk4 = False
-                            else:
-                                st.write(f'Nicely done! We now have a cubic equation:')
-                                st.latex(f'{b3}x^3 + {b2}x^2 + {b1}x + {b0} = 0.')
-                                chk4 = True
-                    else: # fraction root
-                        numer, denom = decimal_to_fraction(root)
-                        st.write(f'Another rational root is {root}, or {numer}/{denom}.')
-                        st.write('Even though this is a fraction, we can still use synthetic division to reduce this quartic equation to a cubic;')
-                        st.write(f' we just have to divide by {denom} at the end.')
-                        sdiv_df = pd.DataFrame({
-                            '0': [f'{root} __|', '', '', ''],
-                            ' ' : [c4, '', '---', '[  ]'],
-                            '  ' : [c3, '', '---', '[  ]'],
-                            '   ' : [c2, '', '---', '[  ]'],
-                            '    ' : [c1, '', '---', '[  ]'],
-                            '     ' : [c0, '', '---', ''],
-                        })
-                        sdiv_df.set_index('0',inplace=True)
-                        b3 = c4
-                        b2 = b3*root + c3
-                        b1 = b2*root + c2
-                        b0 = b1*root + c1
-                        chk4 = False
-                        b3_in = st.text_input(' 1st blank',value = '')
-                        b2_in = st.text_input(' 2nd blank',value = '')
-                        b1_in = st.text_input(' 3rd blank',value = '')
-                        b0_in = st.text_input(' 4th blank',value = '')
-                        if (b3_in.isnumeric) and (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                            b3_in = int(b3_in)
-                            b2_in = int(b2_in)
-                            b1_in = int(b1_in)
-                            b0_in = int(b0_in)
-                            if (b3_in!=b3) or (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                st.write()
-                                chk4 = False
-                            else:
-                                b3 = int(b3/denom)
-                                b2 = int(b2/denom)
-                                b1 = int(b1/denom)
-                                b0 = int(b0/denom)
-                                st.write(f'Nicely done! After dividing those all by {denom}, we have a cubic equation:')
-                                st.latex(f'{b3}x^3 + {b2}x^2 + {b1}x + {b0} = 0.')
-                                chk4 = True # set the flag that we are good to continue with the cubic
-
-                    if chk4==True: # continue
-                        c3 = b3 # reset coefficients
-                        c2 = b2
-                        c1 = b1
-                        c0 = b0
-                        root = roots[2] # get the next root
-                        if root==0: # check to see if the root is zero. 
-                            st.write(f'Another rational root is 0. So we can just divide the equation by x:')
-                            b2 = c3
-                            b1 = c2
-                            b0 = c1
-                            st.write('We now have a quadratic equation:')
-                            st.latex(f'{b2}x^2 + {b1}x + {b0} = 0.')
-                            chk3 = True
-
-                        elif (root%1 == 0): # whole number root
-                            root = int(root)
-                            st.write(f'Another rational root is: {root}')
-                            st.write('Use synthetic division to reduce this cubic equation to a quadratic:')
-                            sdiv_df = pd.DataFrame({
-                                '0': [f'{root} __|', '', '', ''],
-                                '  ' : [c3, '', '---', '[  ]'],
-                                '   ' : [c2, '', '---', '[  ]'],
-                                '    ' : [c1, '', '---', '[  ]'],
-                                '     ' : [c0, '', '---', ''],
-                            })
-                            sdiv_df.set_index('0',inplace=True)
-                            st.table(sdiv_df)
-                            b2 = c3
-                            b1 = b2*root + c2
-                            b0 = b1*root + c1
-                            chk3 = False
-                            b2_in = st.text_input(' 1st blank ',value = '')
-                            b1_in = st.text_input(' 2nd blank ',value = '')
-                            b0_in = st.text_input(' 3rd blank ',value = '')
-                            if (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                                b2_in = int(b2_in)
-                                b1_in = int(b1_in)
-                                b0_in = int(b0_in)
-                                if (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                    st.write('Try again.')
-                                    chk3 = False
-                                else:
-                                    st.write('Nicely done! We now have a quadratic equation:')
-                                    st.latex(f'{b2}x^2 + {b1}x + {b0} = 0.')
-                                    chk3 = True
-                        elif (root%1!=0): # fraction root
-                            numer, denom = decimal_to_fraction(root)
-                            st.write(f'Another rational root is {root}, or {numer}/{denom}.')
-                            st.write('Even though this is a fraction, we can still use synthetic division to reduce this cubic equation to a quadratic;')
-                            st.write(f' we just have to divide by {denom} at the end.')
-                            sdiv_df = pd.DataFrame({
-                                '0': [f'{root} __|', '', '', ''],
-                                '  ' : [c3, '', '---', '[  ]'],
-                                '   ' : [c2, '', '---', '[  ]'],
-                                '    ' : [c1, '', '---', '[  ]'],
-                                '     ' : [c0, '', '---', ''],
-                            })
-                            sdiv_df.set_index('0',inplace=True)
-                            st.table(sdiv_df)
-                            b2 = c3
-                            b1 = b2*root + c2
-                            b0 = b1*root + c1
-                            chk3 = False
-                            b2_in = st.text_input(' 1st blank ',value = '')
-                            b1_in = st.text_input(' 2nd blank ',value = '')
-                            b0_in = st.text_input(' 3rd blank ',value = '')
-                            if (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                                b2_in = int(b2_in)
-                                b1_in = int(b1_in)
-                                b0_in = int(b0_in)
-                                if (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                    st.write('Try again.')
-                                    chk3 = False
-                                else:
-                                    b2 = int(b2/denom)
-                                    b1 = int(b1/denom)
-                                    b0 = int(b0/denom)
-                                    st.write(f'Nicely done! After dividing those all by {denom}, we have a quadratic equation:')
-                                    st.latex(f'{b2}x^2 + {b1}x + {b0} = 0.')
-                                    chk3 = True # set flag that we are good to continue with cubic
-
-            elif c4!=0: # starting with a quartic equation (degree = 4)
-                chk5 = True
-                if chk5==True:
-                    chk4 = False
-                    root = roots[0] # get first root
-                    if root==0: # check for root = 0
-                        st.write(f'Another rational root is 0. So we can just divide the equation by x:')
-                        b3 = c4
-                        b2 = c3
-                        b1 = c2
-                        b0 = c1
-                        st.write('We now have a cubic equation:')
-                        st.latex(f'{b3}x^3 + {b2}x^2 + {b1}x + {b0} = 0.')
-                        chk4 = True # set flag that we are good to continue with cubic
-                    elif root%1 == 0: # whole number root
-                        root = int(root)
-                        st.write(f'One rational root is: {root}')
-                        st.write('Use synthetic division to reduce this quartic equation to a cubic:')
-                        sdiv_df = pd.DataFrame({
-                            '0': [f'{root} __|', '', '', ''],
-                            ' ' : [c4, '', '---', '[  ]'],
-                            '  ' : [c3, '', '---', '[  ]'],
-                            '   ' : [c2, '', '---', '[  ]'],
-                            '    ' : [c1, '', '---', '[  ]'],
-                            '     ' : [c0, '', '---', ''],
-                        })
-                        sdiv_df.set_index('0',inplace=True)
-                        st.table(sdiv_df)
-                        b3 = c4
-                        b2 = b3*root + c3
-                        b1 = b2*root + c2
-                        b0 = b1*root + c1
-                        chk4 = False
-                        b3_in = st.text_input(' 1st blank', value = '')
-                        b2_in = st.text_input(' 2nd blank', value = '')
-                        b1_in = st.text_input(' 3rd blank', value = '')
-                        b0_in = st.text_input(' 4th blank', value = '')
-                    
-                        if (b3_in.isnumeric) and (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):      
-                            b3_in = int(b3_in)
-                            b2_in = int(b2_in)
-                            b1_in = int(b1_in)
-                            b0_in = int(b0_in)
-                            if (b3_in!=b3) or (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                st.write('Try again.')
-                                chk4 = False
-                            else:
-                                st.write('Nicely done! We now have a cubic equation:')
-                                st.latex(f'{b3}x^3 + {b2}x^2 + {b1}x + {b0} = 0.')
-                                chk4 = True # set flag that we are good to continue with the cubic
-                    else: # fraction root
-                        numer, denom = decimal_to_fraction(root)
-                        st.write(f'One rational root is {root}, or {numer}/{denom}.')
-                        st.write('Even though this is a fraction, we can still use synthetic division to reduce this quartic equation to a cubic;')
-                        st.write(f' we just have to divide by {denom} at the end.')
-                        sdiv_df = pd.DataFrame({
-                            '0': [f'{root} __|', '', '', ''],
-                            ' ' : [c4, '', '---', '[  ]'],
-                            '  ' : [c3, '', '---', '[  ]'],
-                            '   ' : [c2, '', '---', '[  ]'],
-                            '    ' : [c1, '', '---', '[  ]'],
-                            '     ' : [c0, '', '---', ''],
-                        })
-                        sdiv_df.set_index('0',inplace=True)
-                        st.table(sdiv_df)
-                        b3 = int(c4)
-                        b2 = int(b3*root + c3)
-                        b1 = int(b2*root + c2)
-                        b0 = int(b1*root + c1)
-                        chk4 = False
-                        b3_in = st.text_input(' 1st blank', value= '')
-                        b2_in = st.text_input(' 2nd blank', value= '')
-                        b1_in = st.text_input(' 3rd blank', value= '')
-                        b0_in = st.text_input(' 4th blank', value= '')
-                         
-                        if (b3_in.isnumeric) and (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):        
-                            b3_in = int(b3_in)
-                            b2_in = int(b2_in)
-                            b1_in = int(b1_in)
-                            b0_in = int(b0_in)
-                            if (b3_in!=b3) or (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                st.write('Try again.')
-                                chk4 = False
-                            else:
-                                b3 = int(b3/denom)
-                                b2 = int(b2/denom)
-                                b1 = int(b1/denom)
-                                b0 = int(b0/denom)
-                                st.write(f'Nicely done! After dividing those all by {denom}, we have a cubic equation:')
-                                st.latex(f'{b3}x^3 + {b2}x^2 + {b1}x + {b0} = 0.')
-                                chk4 = True # set flag that we are good to continue with the cubic
-
-                    if chk4==True: # continue with cubic
-                        c3 = b3
-                        c2 = b2
-                        c1 = b1
-                        c0 = b0
-                        root = roots[1] # get next root
-                        if root==0: # check for root = 0
-                            st.write(f'Another rational root is 0. So we can just divide the equation by x:')
-                            b2 = c3
-                            b1 = c2
-                            b0 = c1
-                            st.write('We now have a quadratic equation:')
-                            st.latex(f'{b2}x^2 + {b1}x + {b0} = 0.')
-                            chk3 = True # set flag that we are ready to solve the quadratic
-
-                        elif (root%1 == 0): # whole number root
-                            root = int(root)
-                            st.write(f'Another rational root is: {root}')
-                            st.write('Use synthetic division to reduce this cubic equation to a quadratic:')
-                            sdiv_df = pd.DataFrame({
-                                '0': [f'{root} __|', '', '', ''],
-                                '  ' : [c3, '', '---', '[  ]'],
-                                '   ' : [c2, '', '---', '[  ]'],
-                                '    ' : [c1, '', '---', '[  ]'],
-                                '     ' : [c0, '', '---', ''],
-                            })
-                            sdiv_df.set_index('0',inplace=True)
-                            st.table(sdiv_df)
-                            b2 = c3
-                            b1 = b2*root + c2
-                            b0 = b1*root + c1
-                            chk3 = False
-                            b2_in = st.text_input(' 1st blank ', value = '')
-                            b1_in = st.text_input(' 2nd blank ', value = '')
-                            b0_in = st.text_input(' 3rd blank ', value = '')
-                            if (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                                b2_in = int(b2_in)
-                                b1_in = int(b1_in)
-                                b0_in = int(b0_in)
-                                if (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                    st.write('Try again.')
-                                    chk3 = False
-                                else:
-                                    st.write('Nicely done! We now have a quadratic equation:')
-                                    st.latex(f'{b2}x^2 + {b1}x + {b0} = 0.')
-                                    chk3 = True # set flag that we are ready to solve the quadratic
-                        elif (root%1!=0): #fraction root
-                            if root>0:
-                                numer, denom = decimal_to_fraction(root)
-                                st.write(f'Another rational root is {root}, or {numer}/{denom}.')
-                            else:
-                                numer, denom = decimal_to_fraction(-1*root)
-                                st.write(f'Another rational root is {root}, or -{numer}/{denom}.')
-                               
-                            st.write('Even though this is a fraction, we can still use synthetic division to reduce this cubic equation to a quadratic;')
-                            st.write(f' we just have to divide by {denom} at the end.')
-                            sdiv_df = pd.DataFrame({
-                                '0': [f'{root} __|', '', '', ''],
-                                '  ' : [c3, '', '---', '[  ]'],
-                                '   ' : [c2, '', '---', '[  ]'],
-                                '    ' : [c1, '', '---', '[  ]'],
-                                '     ' : [c0, '', '---', ''],
-                            })
-                            sdiv_df.set_index('0',inplace=True)
-                            st.table(sdiv_df)
-                            b2 = c3
-                            b1 = b2*root + c2
-                            b0 = b1*root + c1
-                            chk3 = False
-                            b2_in = st.text_input(' 1st blank ', value = '')
-                            b1_in = st.text_input(' 2nd blank ', value = '')
-                            b0_in = st.text_input(' 3rd blank ', value = '')
-                            if (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                                b2_in = int(b2_in)
-                                b1_in = int(b1_in)
-                                b0_in = int(b0_in)
-                                if (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                    st.write('Try again.')
-                                    chk3 = False
-                                else:
-                                    b2 = int(b2/denom)
-                                    b1 = int(b1/denom)
-                                    b0 = int(b0/denom)
-                                    st.write(f'Nicely done! After dividing those all by {denom}, we have a quadratic equation:')
-                                    st.latex(f'{b2}x^2 + {b1}x + {b0} = 0.')
-                                    chk3 = True # set flag that we are ready to solve the quadratic
-
-            else: # start with cubic
-                chk5 = True
-                if chk5==True:
-                    chk4 = True
-                    if chk4==True:
-                        c3 = b3
-                        c2 = b2
-                        c1 = b1
-                        c0 = b0
-                        root = roots[0]
-                        if root==0: # check for root = 0
-                            st.write(f'One rational root is 0. So we can just divide the equation by x:')
-                            b2 = c3
-                            b1 = c2
-                            b0 = c1
-                            st.write('We now have a quadratic equation:')
-                            st.latex(f'{b2}x^2 + {b1}x + {b0} = 0.')
-                            chk3 = True # set flag that we are ready to solve the quadratic
-
-                        elif (root%1 == 0): # whole number root 
-                            root = int(root)
-                            st.write(f'One rational root is: {root}')
-                            st.write('Use synthetic division to reduce this cubic equation to a quadratic:')
-                            sdiv_df = pd.DataFrame({
-                                '0': [f'{root} __|', '', '', ''],
-                                '  ' : [c3, '', '---', '[  ]'],
-                                '   ' : [c2, '', '---', '[  ]'],
-                                '    ' : [c1, '', '---', '[  ]'],
-                                '     ' : [c0, '', '---', ''],
-                            })
-                            sdiv_df.set_index('0',inplace=True)
-                            st.table(sdiv_df)
-                            b2 = c3
-                            b1 = b2*root + c2
-                            b0 = b1*root + c1
-                            chk3 = False
-                            b2_in = st.text_input(' 1st blank ', value = '')
-                            b1_in = st.text_input(' 2nd blank ', value = '')
-                            b0_in = st.text_input(' 3rd blank ', value = '')
-                            if (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                                b2_in = int(b2_in)
-                                b1_in = int(b1_in)
-                                b0_in = int(b0_in)
-                                if (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                    st.write('Try again.')
-                                    chk3 = False
-                                else:
-                                    st.write('Nicely done! We now have a quadratic equation:')
-                                    st.latex(f'{b2}x^2 + {b1}x + {b0} = 0.')
-                                    chk3 = True # set flag that we are ready to solve the quadratic
-                        elif (root%1!=0): # fraction root
-                            numer, denom = decimal_to_fraction(root)
-                            st.write(f'One rational root is {root}, or {numer}/{denom}.')
-                            st.write('Even though this is a fraction, we can still use synthetic division to reduce this cubic equation to a quadratic;')
-                            st.write(f' we just have to divide by {denom} at the end.')
-                            sdiv_df = pd.DataFrame({
-                                '0': [f'{root} __|', '', '', ''],
-                                '  ' : [c3, '', '---', '[  ]'],
-                                '   ' : [c2, '', '---', '[  ]'],
-                                '    ' : [c1, '', '---', '[  ]'],
-                                '     ' : [c0, '', '---', ''],
-                            })
-                            sdiv_df.set_index('0',inplace=True)
-                            st.table(sdiv_df)
-                            b2 = c3
-                            b1 = b2*root + c2
-                            b0 = b1*root + c1
-                            chk3 = False
-                            b2_in = st.text_input(' 1st blank ', value= '')
-                            b1_in = st.text_input(' 2nd blank ', value= '')
-                            b0_in = st.text_input(' 3rd blank ', value= '')
-                            if (b2_in.isnumeric) and (b1_in.isnumeric) and (b0_in.isnumeric):
-                                b2_in = int(b2_in)
-                                b1_in = int(b1_in)
-                                b0_in = int(b0_in)
-                                if (b2_in!=b2) or (b1_in!=b1) or (b0_in!=b0):
-                                    st.write('Try again.')
-                                    chk3 = False
-                                else:
-                                    b2 = int(b2/denom)
-                                    b1 = int(b1/denom)
-                                    b0 = int(b0/denom)
-                                    st.write(f'Nicely done! After dividing those all by {denom}, we have a quadratic equation:')
-                                    st.latex(f'{b2}x^2 + {b1}x + {b0} = 0.')
-                                    chk3 = True # set flag that we are ready to solve the quadratic
+                st.table(synthetic_division_table(poly, root))
+                row = poly.synthetic_row(root)[:-1] # the blanks (the remainder is 0)
+                # the labels are padded with spaces so every step gets its own text boxes
+                blanks = [st.text_input(f'{ordinal(k+1)} blank' + ' '*(poly.degree - 3), value='') for k in range(len(row))]
+                if any(b.strip() == '' for b in blanks): # not filled in yet
+                    chk3 = False
+                    break
+                if any(re.fullmatch(r'-?[0-9]+', b.strip()) is None for b in blanks) or (any(int(b) != c for b, c in zip(blanks, row))): # whole numbers only
+                    st.write('Try again.')
+                    chk3 = False
+                    break
+                poly = deflations[step+1]
+                if denom == 1:
+                    st.write(f'Nicely done! We now have a {degree_name(poly.degree)} equation:')
+                else:
+                    st.write(f'Nicely done! After dividing those all by {denom}, we have a {degree_name(poly.degree)} equation:')
+                st.latex(f'{poly} = 0.')
 
             if chk3==True: # solve the quadratic
+                b2, b1, b0 = [int(c) for c in poly.coefs]
                 st.write('Almost done! Solve the quadratic by the method of your choice (square roots, factoring, completing the square, quadratic formula)')
                 st.write('Select all CORRECT solutions below.')
 
@@ -3084,17 +1817,11 @@ elif eqn_type == 'Polynomial Equations':
                 negb = -1*b1
                 twoa = 2*b2
                 disc = b1*b1 - 4*b2*b0
-                vertex_x = negb/twoa
+                vertex_x = Fraction(negb,twoa)
                 if vertex_x == 0:
                     vert_str = ''
-                elif vertex_x%1 == 0:
-                    vert_str = f'{vertex_x}'
-                elif vertex_x > 0:
-                    numer, denom = decimal_to_fraction(vertex_x)
-                    vert_str = f'{numer}/{denom}'
-                elif vertex_x < 0:
-                    numer, denom = decimal_to_fraction(-1*vertex_x)
-                    vert_str = f'-{numer}/{denom}'
+                else:
+                    vert_str = f'{vertex_x}' # whole number, or numerator/denominator
                 if disc==0: # discriminant = 0, only 1 real solution
                     sqrt_str = ''
                     wrong = f'{b0}'
@@ -3112,9 +1839,9 @@ elif eqn_type == 'Polynomial Equations':
                         st.balloons()
                 else: # 2 solutions
                     if disc>0: #2 real solutions
-                        out_rad, in_rad, denom = simplify_radical(disc/(twoa*twoa))
+                        out_rad, in_rad, denom = simplify_radical(Fraction(disc,twoa*twoa))
                     else: # 2 complex solutions
-                        out_rad, in_rad, denom = simplify_radical(-1*disc/(twoa*twoa))
+                        out_rad, in_rad, denom = simplify_radical(Fraction(-1*disc,twoa*twoa))
                     if out_rad==1: # format for whether there is a square root, a fraction, i
                         if in_rad==1:
                             if denom==1:
@@ -3155,9 +1882,9 @@ elif eqn_type == 'Polynomial Equations':
                         correct = [sqrt_str, '-' + sqrt_str]
                     else: # or b not = 0
                         correct = [vert_str + ' + ' + sqrt_str, vert_str + ' - ' + sqrt_str]
-                    correct = [c if ('square_root' in c) or ('i' in c) else str(np.round(eval(c),4)) for c in correct] # get decimals where appropriate
+                    correct = [c if ('square_root' in c) or ('i' in c) else str(np.round(evaluate_number(c),4)) for c in correct] # get decimals where appropriate
                     incorrect = [vert_str + ' + ' + wrong, vert_str + ' - ' + wrong]
-                    incorrect = [c if ('square_root' in c) or ('i' in c) else str(np.round(eval(c),4)) for c in incorrect]
+                    incorrect = [c if ('square_root' in c) or ('i' in c) else str(np.round(evaluate_number(c),4)) for c in incorrect]
                     solution_options = correct + incorrect
                     solution_options.sort()
                     sel1 = st.checkbox(solution_options[0])
@@ -0,0 +1,1296 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ### Core functions for the app (no streamlit calls, so these can be imported and run anywhere)
+
+# IMPORTS
+import os
+import re
+import math
+import random
+import numpy as np
+from fractions import Fraction
+from functools import lru_cache
+
+# EXPRESSION ENGINE
+#
+# An equation side like '4x - 3 + 2(x + 5)' is tokenized and parsed once into a tree of tuples:
+#   ('num', value), ('x',), ('neg', node),
+#   ('sum', [('+', node), ('-', node), ...]), ('product', [('*', node), ('/', node), ...])
+# and the tree is then turned into a python function of x, so it can be evaluated at any value
+# without any more string work. Sums and products hold all of their terms in one list, so the tree only gets
+# deeper with nested parentheses, never with the length of the expression -- parsing, compiling and evaluating
+# all take one pass over the expression.
+
+# one regular expression pass splits the string into numbers, 'x', operators and parentheses
+# (anything else falls into the last group and is reported as an error by the parser)
+token_pattern = re.compile(r'\s*(?:(\d+\.?\d*|\.\d+)|([x()+\-*/])|(\S))')
+
+
+def tokenize(expression):
+    # This function splits an expression string into a list of tokens: numbers become ('num', value),
+    # everything else becomes (character,)
+    tokens = []
+    for number, symbol, other in token_pattern.findall(expression):
+        if number:
+            # keep whole numbers as int, like eval would
+            if '.' in number:
+                value = float(number)
+                if math.isinf(value): # too many digits to be a float (it would be inf)
+                    raise ValueError(f'Number too large in "{expression}"')
+                tokens.append(('num', value))
+            else:
+                tokens.append(('num', int(number)))
+        elif symbol:
+            tokens.append((symbol,))
+        elif other:
+            raise ValueError(f'Unexpected character "{other}" in "{expression}"')
+    return tokens
+
+
+class Parser:
+    # Recursive-descent parser for expressions in x:
+    #   expr    := term (('+' | '-') term)*
+    #   term    := unary (('*' | '/') unary | implied multiplication)*
+    #   unary   := ('+' | '-')* primary
+    #   primary := number | 'x' | '(' expr ')'
+    # Implied multiplication is a number, 'x' or ')' followed directly by 'x' or '(' -- as in 4x, 2(x + 1), x(x - 3).
+    # Parentheses can be nested to any reasonable depth (max_depth, to stay well inside python's recursion limit);
+    # a run of signs like '- - -3' is folded in a loop, so it never adds to the depth however long it is.
+
+    max_depth = 100
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.tokens = tokenize(expression)
+        self.pos = 0
+        self.depth = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos][0]
+        return None
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if len(self.tokens) == 0:
+            raise ValueError('Empty expression')
+        node = self.expr()
+        if self.peek() is not None:
+            raise ValueError(f'Unexpected "{self.peek()}" in "{self.expression}"')
+        return node
+
+    def expr(self):
+        terms = [('+', self.term())]
+        while self.peek() in ('+', '-'):
+            op = self.take()[0]
+            terms.append((op, self.term()))
+        if len(terms) == 1:
+            return terms[0][1]
+        return ('sum', terms)
+
+    def term(self):
+        factors = [('*', self.unary())]
+        while self.peek() in ('*', '/', 'x', '('):
+            if self.peek() in ('*', '/'):
+                op = self.take()[0]
+                factors.append((op, self.unary()))
+            else: # implied multiplication, e.g. 4x or 2(x + 1)
+                factors.append(('*', self.primary()))
+        if len(factors) == 1:
+            return factors[0][1]
+        return ('product', factors)
+
+    def unary(self):
+        negative = False
+        while self.peek() in ('+', '-'):
+            if self.take()[0] == '-':
+                negative = not negative
+        node = self.primary()
+        if negative:
+            return ('neg', node)
+        return node
+
+    def primary(self):
+        kind = self.peek()
+        if kind == 'num':
+            return ('num', self.take()[1])
+        if kind == 'x':
+            self.take()
+            return ('x',)
+        if kind == '(':
+            self.take()
+            self.depth += 1
+            if self.depth > self.max_depth:
+                raise ValueError(f'Too many nested parentheses in "{self.expression}"')
+            node = self.expr()
+            if self.peek() != ')':
+                raise ValueError(f'Missing ")" in "{self.expression}"')
+            self.take()
+            self.depth -= 1
+            return node
+        if kind is None:
+            raise ValueError(f'Expression ends too early: "{self.expression}"')
+        raise ValueError(f'Unexpected "{kind}" in "{self.expression}"')
+
+
+def parse_expression(expression):
+    # This function returns the parsed tree for an expression string
+    return Parser(expression).parse()
+
+
+def build_function(node, exact=False):
+    # This function turns a parsed tree into a python function of x (nested closures, built once).
+    # With exact=True the numbers become Fractions, so evaluating at a Fraction gives an exact Fraction.
+    kind = node[0]
+    if kind == 'num':
+        value = node[1]
+        if exact:
+            value = to_fraction(value)
+        return lambda x: value
+    if kind == 'x':
+        return lambda x: x
+    if kind == 'neg':
+        inner = build_function(node[1], exact)
+        return lambda x: -inner(x)
+    first = build_function(node[1][0][1], exact)
+    rest = [(op, build_function(part, exact)) for op, part in node[1][1:]]
+    if kind == 'sum':
+        def total(x):
+            value = first(x)
+            for op, part in rest:
+                if op == '+':
+                    value = value + part(x)
+                else:
+                    value = value - part(x)
+            return value
+        return total
+    def product(x):
+        value = first(x)
+        for op, part in rest:
+            if op == '*':
+                value = value * part(x)
+            else:
+                value = value / part(x)
+        return value
+    return product
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression):
+    # This function parses and compiles an expression string once; repeated calls with the same string
+    # (every streamlit rerun re-checks the same lines) come straight from the cache
+    return build_function(parse_expression(expression))
+
+
+@lru_cache(maxsize=1024)
+def compile_exact(expression):
+    # Same as compile_expression, but the compiled function does exact Fraction arithmetic
+    return build_function(parse_expression(expression), exact=True)
+
+
+def evaluate_array(expression, values):
+    # This function evaluates an expression at a whole numpy array of x values in one pass
+    # (the compiled closures only use + - * /, so they work on arrays as well as on single numbers).
+    # Sides without an x come back as a single number, so broadcast to the shape of the input.
+    values = np.asarray(values, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = compile_expression(expression)(values)
+    return np.broadcast_to(np.asarray(result, dtype=float), values.shape)
+
+
+def evaluate_number(expression):
+    # This function safely evaluates a plain arithmetic string with no x, like '-2 + 3/4', in place of eval:
+    # anything other than numbers, + - * / and parentheses is rejected when the string is parsed
+    if 'x' in expression:
+        raise ValueError(f'Expected a number, not an expression in x: "{expression}"')
+    return compile_expression(expression)(0)
+
+
+# LINEAR CANONICAL FORM
+#
+# Every linear side reduces exactly to a*x + b, with a and b kept as Fractions, so two linear equations
+# can be compared without plugging in any test values at all.
+
+def to_fraction(value):
+    # This function turns a parsed number into an exact Fraction (str() keeps 0.1 as 1/10, not the nearest float)
+    if isinstance(value, float):
+        return Fraction(str(value))
+    return Fraction(value)
+
+
+def reduce_linear(node):
+    # This function reduces a parsed tree to the pair (a, b) meaning a*x + b.
+    # It raises a ValueError if the expression is not linear in x (x times x, or dividing by x).
+    kind = node[0]
+    if kind == 'num':
+        return Fraction(0), to_fraction(node[1])
+    if kind == 'x':
+        return Fraction(1), Fraction(0)
+    if kind == 'neg':
+        a, b = reduce_linear(node[1])
+        return -a, -b
+    a1, b1 = reduce_linear(node[1][0][1])
+    for op, part in node[1][1:]:
+        a2, b2 = reduce_linear(part)
+        if op == '+':
+            a1, b1 = a1 + a2, b1 + b2
+        elif op == '-':
+            a1, b1 = a1 - a2, b1 - b2
+        elif op == '*':
+            if a1 == 0:
+                a1, b1 = b1*a2, b1*b2
+            elif a2 == 0:
+                a1, b1 = a1*b2, b1*b2
+            else:
+                raise ValueError('Expression is not linear in x')
+        else: # division: only by a number
+            if a2 != 0:
+                raise ValueError('Expression is not linear in x')
+            if b2 == 0:
+                raise ValueError('Division by zero')
+            a1, b1 = a1/b2, b1/b2
+    return a1, b1
+
+
+@lru_cache(maxsize=1024)
+def linear_form(expression):
+    # This function returns the exact (a, b) for an expression string a*x + b, parsing it only once
+    return reduce_linear(parse_expression(expression))
+
+
+def identically_zero(node):
+    # This function checks exactly whether a parsed expression is 0 for every x, like 2 - 2 or x*x - x*x.
+    # Written as one fraction, its numerator has degree at most n (degree_bound), so if it is 0 at n + 1 points where
+    # it is defined, it is 0 everywhere. It is undefined at d points at most, so the points 0, 1, ..., n + d will do.
+    # (Any division by zero inside it has to be ruled out first; divides_by_zero does that.)
+    n, d = degree_bound(node)
+    function = build_function(node, exact=True)
+    zeros = 0
+    for k in range(n + d + 1):
+        try:
+            if function(Fraction(k)) != 0:
+                return False
+        except ZeroDivisionError: # one of the points where it is undefined
+            continue
+        zeros += 1
+        if zeros > n:
+            return True
+    return True # (not reached: there are never more than d points where it is undefined)
+
+
+@lru_cache(maxsize=1024)
+def divides_by_zero(expression):
+    # This function checks whether an expression string divides by something that is exactly 0 for every x, like 1/0,
+    # 3/(2x - 2x) or 1/(x*x - x*x) (such a side is undefined everywhere, and with plain numbers python would raise
+    # ZeroDivisionError)
+    def walk(node):
+        if node[0] == 'neg':
+            return walk(node[1])
+        if node[0] in ('num', 'x'):
+            return False
+        for op, part in node[1]:
+            if walk(part):
+                return True
+            if (op == '/') and identically_zero(part):
+                return True
+        return False
+    return walk(parse_expression(expression))
+
+
+def equation_form(left, right):
+    # This function moves everything to one side: left = right becomes (a, b) for a*x + b = 0
+    a_left, b_left = linear_form(left)
+    a_right, b_right = linear_form(right)
+    return a_left - a_right, b_left - b_right
+
+
+def same_linear_equation(old_form, new_form):
+    # This function decides if two linear equations a*x + b = 0 are logically equivalent:
+    # a legal step can only multiply (a, b) by some non-zero number (switching the sides multiplies by -1),
+    # so the two pairs have to be non-zero multiples of each other. That is exact, for any size of coefficient.
+    a_old, b_old = old_form
+    a_new, b_new = new_form
+    if (a_old == 0 and b_old == 0) or (a_new == 0 and b_new == 0):
+        # 0 = 0 is only equivalent to another equation that is always true
+        return a_old == b_old == a_new == b_new == 0
+    return a_old*b_new == b_old*a_new
+
+
+def same_at_test_values(prior, current, check_vals):
+    # This function compares two equations (each split into [left, right]) at an array of test values.
+    # It is only needed for sides that are not linear, where there is no exact (a, b) form.
+    old_left  = evaluate_array(prior[0],check_vals)
+    old_right = evaluate_array(prior[1],check_vals)
+    new_left  = evaluate_array(current[0],check_vals)
+    new_right = evaluate_array(current[1],check_vals)
+    #
+    # whether or not the test value makes either equation true, the discrepancy should stay the same -
+    # left - right for the 1st equation should equal left - right for the 2nd equation, so
+    # (old_left - old_right) - (new_left - new_right) should equal zero or have a constant ratio for all test vals.
+    old_diff = np.abs(old_left - old_right)
+    new_diff = np.abs(new_left - new_right)
+    # round after 6 decimal places to prevent computational error from throwing false logical errors
+    # + put in absolute value to account for user switching the left and right sides -- logically allowed.
+    chk_sum = np.abs(np.round(old_diff - new_diff,6))
+    # have to exclude the solution, if it is in the test set, to avoid dividing by zero:
+    nonzero = new_diff>0
+    ratio = np.abs(np.round(old_diff[nonzero] / new_diff[nonzero],6))
+    if len(ratio)>0:
+        with np.errstate(invalid='ignore'): # a side undefined at a test value gives nan, which fails the check
+            chk_ratio = np.abs(np.round(ratio.max()-ratio.min(),6))
+    else: # the new line is true for every test value, so there is no ratio to compare
+        chk_ratio = 1
+    return (chk_sum.max()==0) or (chk_ratio==0)
+
+
+# RANDOMIZED IDENTITY TESTING
+#
+# For equations that are not linear there is no (a, b) form, so they are compared at test points instead.
+# A correct step can only multiply left - right by a non-zero number c, so old_diff(x) = c*new_diff(x) for every x.
+# If the step is wrong, old_diff(x)*new_diff(y) - old_diff(y)*new_diff(x) is a non-zero polynomial (after clearing
+# denominators) of low degree, so by the Schwartz-Zippel lemma it is very unlikely to vanish at points drawn at random
+# from a huge set -- a couple of random rational points are enough, where 21 fixed points could still be fooled.
+# The points are evaluated with exact Fraction arithmetic, so there is no rounding to worry about either.
+
+# random points are p/q with |p| <= random_numerator and 1 <= q <= random_denominator
+random_numerator = 10**6
+random_denominator = 10**3
+
+# equations of higher degree than this (numerator or denominator, see degree_bound) are turned away by
+# check_input_equation: checking them exactly gets slower with every power of x, and the app never needs them
+max_equation_degree = 12
+
+
+def degree_bound(node):
+    # This function returns (n, d): upper bounds on the degrees of the numerator and denominator of the expression,
+    # written as one fraction of polynomials in x
+    kind = node[0]
+    if kind == 'num':
+        return 0, 0
+    if kind == 'x':
+        return 1, 0
+    if kind == 'neg':
+        return degree_bound(node[1])
+    n1, d1 = degree_bound(node[1][0][1])
+    for op, part in node[1][1:]:
+        n2, d2 = degree_bound(part)
+        if op in ('+', '-'):
+            n1, d1 = max(n1 + d2, n2 + d1), d1 + d2
+        elif op == '*':
+            n1, d1 = n1 + n2, d1 + d2
+        else:
+            n1, d1 = n1 + d2, d1 + n2
+    return n1, d1
+
+
+def equation_degree(left, right):
+    # This function returns (n, d) for left - right
+    n1, d1 = degree_bound(parse_expression(left))
+    n2, d2 = degree_bound(parse_expression(right))
+    return max(n1 + d2, n2 + d1), d1 + d2
+
+
+def random_sample_count(degree, tolerance=1e-12):
+    # This function returns how many random points to use, so that a wrong step passes with probability < tolerance.
+    # Each pair of points fails to catch a wrong step with probability at most 2*degree/(size of the point set),
+    # so the number of pairs needed grows (slowly) with the degree.
+    set_size = (2*random_numerator + 1)*random_denominator
+    miss = min(0.5, 2*max(degree, 1)/set_size)
+    pairs = math.ceil(math.log(tolerance)/math.log(miss))
+    return 2*pairs
+
+
+def proportional(old_vals, new_vals):
+    # This function checks that old_vals = c*new_vals for one non-zero number c (exact values, any length)
+    pivot = [j for j, v in enumerate(new_vals) if v != 0]
+    if len(pivot) == 0: # the new line is true at every point, so the old one has to be as well
+        return all(v == 0 for v in old_vals)
+    j = pivot[0]
+    if old_vals[j] == 0:
+        return False
+    return all(old_vals[i]*new_vals[j] == old_vals[j]*new_vals[i] for i in range(len(old_vals)))
+
+
+def same_at_random_points(prior, current, exact=False, rng=None):
+    # This function compares two equations (each split into [left, right]) at random rational points.
+    # The number of points comes from the degrees of both equations: random_sample_count of them normally, or
+    # with exact=True enough points (degree + 1) that agreement at all of them proves the step is correct.
+    # Returns None if no usable points can be found (for instance a side divides by zero everywhere).
+    n_old, d_old = equation_degree(prior[0], prior[1])
+    n_new, d_new = equation_degree(current[0], current[1])
+    degree = max(n_old + d_new, n_new + d_old) # degree of old_diff*new_denominator - c*new_diff*old_denominator
+    if exact:
+        samples = degree + 1
+    else:
+        samples = min(degree + 1, random_sample_count(degree))
+    samples = max(samples, 2)
+    if rng is None: # seed from the equations, so the same step always gets the same verdict
+        rng = random.Random(prior[0] + '=' + prior[1] + '|' + current[0] + '=' + current[1])
+    sides = [compile_exact(side) for side in prior + current]
+    points = set()
+    old_vals = []
+    new_vals = []
+    attempts = 0
+    while len(old_vals) < samples:
+        attempts += 1
+        if attempts > 10*samples + 10:
+            return None
+        point = Fraction(rng.randint(-random_numerator, random_numerator), rng.randint(1, random_denominator))
+        if point in points:
+            continue
+        try:
+            old_left, old_right, new_left, new_right = [side(point) for side in sides]
+        except ZeroDivisionError: # landed on a point where a side is undefined, draw another
+            continue
+        points.add(point)
+        old_vals.append(old_left - old_right)
+        new_vals.append(new_left - new_right)
+    return proportional(old_vals, new_vals)
+
+
+# STEP CHECKING
+
+def get_val(expression,val):
+    # This function evaluates an algebraic expression of x (input as string) at a specified value
+    # The string is only parsed the first time it is seen (see compile_expression above);
+    # after that it is a plain function call
+    return compile_expression(expression)(val)
+
+
+def parentheses_match(expression):
+    # This function checks that every '(' is closed by a later ')', in a single pass
+    depth = 0
+    for c in expression:
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0
+
+
+def check_input_equation(equation):
+    # This function is for when a user chooses to type in a starting equation, 
+    # checks to see if is it valid and of the specified form.
+    
+    # initialize return variables:
+    valid = False
+    solved = False
+    output_str = ''
+    
+    # is it even an equation?
+    num_equal = len([m.start() for m in re.finditer('=', equation)])
+    if num_equal != 1:
+        output_str = 'Sorry, this is not a valid equation; please retype.'
+        return valid, solved, output_str
+    
+    # check both sides now:
+    sides = equation.split('=')
+
+    # parentheses check, one pass over each side (any number of distributions, nested or not, is fine):
+    for side, name in zip(sides, ['left', 'right']):
+        if parentheses_match(side) == False:
+            output_str = f'Your {name} side appears to have unmatched parentheses; please retype.'
+            return valid, solved, output_str
+    
+    # check that the equation uses only 'x':
+    other_variables = 'abcdefghijklmnopqrstuvwyz'
+    other_variables += other_variables.upper()
+    if sum([1 for c in other_variables if c in equation])>0:
+        output_str = 'Please retype your equation using "x" as your variable.'
+        return valid, solved, output_str
+    
+    # check that each side only uses numbers, x, + - * / and parentheses (nothing typed in is ever run as python):
+    for side, name in zip(sides, ['left', 'right']):
+        try:
+            compile_expression(side)
+        except ValueError:
+            output_str = f'Sorry, the app cannot read your {name} side; please use only numbers, x, + - * / and parentheses.'
+            return valid, solved, output_str
+    
+    # check that the equation is not of a higher degree than the app can check quickly (like 'xxxxxxxxxxxxxxx = 1'):
+    if max(equation_degree(sides[0], sides[1])) > max_equation_degree:
+        output_str = 'Sorry, this equation has too high a power of x for the app to check; please retype.'
+        return valid, solved, output_str
+    
+    # check that neither side divides by zero, with or without x (exactly, so 1/(3 - 3) is caught as well):
+    if divides_by_zero(sides[0]) or divides_by_zero(sides[1]):
+        output_str = 'Your equation divides by zero; please retype.'
+        return valid, solved, output_str
+    
+    # if there is no variable, it can still be valid, at the end of the solving process:
+    if 'x' not in equation:
+        a, b = equation_form(sides[0], sides[1]) # compare the two numbers exactly
+        if  b != 0:
+            output_str = 'Your equation does not have a variable, and is false. (no solution)'
+            valid = True
+            solved = True
+            return valid, solved, output_str
+        else: 
+            output_str = 'Your equation does not have a variable, and is true. (infinite solutions)'
+            valid = True
+            solved = True
+            return valid, solved, output_str
+    
+    # if all checks passed:
+    valid = True
+    return valid, solved, output_str
+
+# https://stackoverflow.com/questions/4664850/how-to-find-all-occurrences-of-a-substring
+
+
+def read_equation(equation):
+    # This function reads one whole line (whitespace already removed) for checking:
+    # it returns (valid, solved, output_str, sides, form), where valid/solved/output_str come from check_input_equation,
+    # sides is [left, right] and form is the exact (a, b) of a*x + b = 0, or None if the equation is not linear.
+    # Each line of a solution only needs to be read once, however many steps it is part of.
+    valid, solved, output_str = check_input_equation(equation)
+    if valid == False:
+        return valid, solved, output_str, None, None
+    sides = equation.split('=')
+    try:
+        form = equation_form(sides[0], sides[1])
+    except ValueError:
+        form = None
+    return valid, solved, output_str, sides, form
+
+
+def compare_lines(prior, current, check_vals=None, exact=False):
+    # This function does the actual checking of one step, for two lines already read by read_equation
+    #
+    # check that both equations are valid equations:
+    chk0, solved0, output_str, prior_sides, prior_form = prior
+    if chk0==False:
+        output_str += ' [Error: prior line is not an equation]'
+        return False, solved0, output_str
+    chk1, solved, output_old, current_sides, current_form = current # output_old: string returned from checking the new equation
+    if chk1==False:
+        output_str = output_old + ' [Error: new line is not an equation]'
+        return False, solved, output_str
+    # linear equations: compare the exact a*x + b = 0 forms, no test values needed
+    if (prior_form is not None) and (current_form is not None):
+        correct = same_linear_equation(prior_form, current_form)
+    elif check_vals is not None: # not linear, and specific test values were asked for
+        correct = same_at_test_values(prior_sides, current_sides, check_vals)
+    else: # not linear: check at random points (see same_at_random_points)
+        correct = same_at_random_points(prior_sides, current_sides, exact)
+        if correct is None: # no point where every side is defined: a line that means nothing is not a correct step
+            correct = False
+    # output
+    if correct:
+        output_str = 'That step was correct'
+        # is it solved?
+        # If so, only one character from this string should show up: 'x', exactly once,
+        # and one side or the other should be exactly equal to 'x'
+        operations = '+-*()x'
+        solvedx = sum([1 for c in current_sides[0] if c in operations] + [1 for c in current_sides[1] if c in operations])
+        if (solvedx == 2) and ((current_sides[0][0]=='-') or (current_sides[1][0]=='-')):
+            solvedx = 1
+        if ((current_sides[0]=='x') or (current_sides[1]=='x')) and (solvedx==1):
+            output_str += ', and you solved the equation!'
+            return True, True, output_str
+        elif solved==1:
+            output_str += ' - ' + output_old
+            return True, True, output_str
+        else:
+            output_str += '; keep it up!'
+            return True, False, output_str
+    else:
+        output_str = "That's not quite correct. Try again."
+        return False, False, output_str
+
+
+def check_logic(prior, current, check_vals=None, exact=False):
+    # This function compares two complete equations for logical equivalency
+    #
+    # remove all whitespace - this doesn't matter for checking logical consistency,
+    # but does matter for checking for a solution where one side is just 'x'
+    prior = prior.replace(' ','')
+    current = current.replace(' ','')
+    #
+    # streamlit reruns the whole script at every interaction, so the same (prior, current) pairs get checked
+    # over and over: unless specific test values are given, remember the verdicts and only check new pairs
+    #
+    # equations that are not linear are checked at random points, or at check_vals if given;
+    # exact=True uses enough random points to be certain rather than just overwhelmingly likely
+    if check_vals is None:
+        return check_logic_cached(prior, current, exact)
+    return check_step(prior, current, check_vals, exact)
+
+
+@lru_cache(maxsize=512)
+def check_logic_cached(prior, current, exact=False):
+    # check_logic for whitespace-free strings without specific test values, with the last 512 verdicts kept
+    return check_step(prior, current, None, exact)
+
+
+def check_step(prior, current, check_vals=None, exact=False):
+    # This function checks one step (prior and current already have no whitespace)
+    return compare_lines(read_equation(prior), read_equation(current), check_vals, exact)
+
+
+def diagnose(equation):
+    # This function returns a hint based on the type of equation, if the student missed a step
+    if sum([1 for c in equation if c=='x'])==1: # if there is only one x
+        diagnosis = 'Try adding or subtracting, and then dividing.'
+    else:
+        if sum([1 for c in equation if c=='('])>0: # there is distribution
+            if sum([1 for c in equation if c=='x'])>2: # there is combining like terms
+                diagnosis = 'Try distributing, then combining like terms.'
+            else: # there is no combining like terms, but there is still distribution
+                diagnosis = 'Try distributing.'
+        else: # there is no distribution
+            if sum([1 for c in equation if c=='x'])>2: # there is combining like terms
+                diagnosis = 'Try combining like terms.'
+            else: # no distribution and no combining like terms
+                diagnosis = 'Try adding or subtracting, and then dividing.'
+    return diagnosis
+
+
+def grade_transcript(equation, lines, check_vals=None, exact=False):
+    # This function grades a whole solution at once, without streamlit: the starting equation plus the list of lines
+    # the student wrote after it. Every line is read once and shared by the two steps it belongs to.
+    # It returns (results, solved, diagnosis):
+    #   results   - one (valid, solved, output_str) per line, exactly as check_logic would give for that step
+    #   solved    - True if the last line was a correct step that solves the equation
+    #   diagnosis - the hint for the first incorrect step (from the line before it), or '' if every step was correct
+    all_lines = [equation] + list(lines)
+    readings = [read_equation(line.replace(' ','')) for line in all_lines]
+    results = []
+    diagnosis = ''
+    for n in range(1, len(readings)):
+        valid, solved, output_str = compare_lines(readings[n-1], readings[n], check_vals, exact)
+        results.append((valid, solved, output_str))
+        if (valid == False) and (diagnosis == ''):
+            diagnosis = diagnose(all_lines[n-1])
+    solved = (len(results) > 0) and results[-1][0] and results[-1][1]
+    return results, solved, diagnosis
+
+
+# FRACTIONS AND RADICALS
+
+# smallest prime factor of every number below sieve_limit, built once when the module is imported
+sieve_limit = 10**6
+
+
+def build_spf_sieve(limit):
+    # This function returns an array spf where spf[n] is the smallest prime factor of n (for 2 <= n < limit)
+    spf = np.zeros(limit, dtype=np.int32)
+    for p in range(2, math.isqrt(limit-1)+1):
+        if spf[p] == 0: # p is prime: it is the smallest factor of its multiples that don't have one yet
+            multiples = spf[p*p::p]
+            multiples[multiples == 0] = p
+    primes = np.nonzero(spf == 0)[0]
+    primes = primes[primes >= 2]
+    spf[primes] = primes
+    return spf
+
+
+smallest_prime_factor = build_spf_sieve(sieve_limit)
+sieve_primes = [int(p) for p in np.nonzero(smallest_prime_factor[2:] == np.arange(2, sieve_limit))[0] + 2]
+
+
+def factorize(n):
+    # This function returns the prime factorization of a positive integer as a dictionary {prime: exponent}.
+    # Below sieve_limit it just follows the smallest-prime-factor sieve (one step per prime factor, so O(log n));
+    # larger numbers are trial divided by the sieve primes until what is left is small enough for the sieve.
+    factors = {}
+    n = int(n)
+    if n < 1:
+        raise ValueError(f'Only positive whole numbers can be factorized, not {n}')
+    if n >= sieve_limit:
+        for p in sieve_primes:
+            if p*p > n:
+                break
+            while n % p == 0:
+                factors[p] = factors.get(p, 0) + 1
+                n //= p
+            if n < sieve_limit:
+                break
+        if n >= sieve_limit: # no factor up to sqrt(n) among the sieve primes
+            p = sieve_primes[-1] + 2
+            while p*p <= n: # only reached for numbers beyond sieve_limit**2
+                while n % p == 0:
+                    factors[p] = factors.get(p, 0) + 1
+                    n //= p
+                p += 2
+            if n > 1:
+                factors[n] = factors.get(n, 0) + 1
+            return factors
+    while n > 1:
+        p = int(smallest_prime_factor[n])
+        factors[p] = factors.get(p, 0) + 1
+        n //= p
+    return factors
+
+
+def square_part(n):
+    # This function splits a whole number into n = out**2 * inside, with inside square-free,
+    # for instance square_part(72) --> 6, 2 because 72 = 6*6*2
+    if n < 0: # there is no such split (the square root of a negative number is handled with i by the caller)
+        raise ValueError(f'Cannot take the square part of a negative number: {n}')
+    if n == 0:
+        return 0, 1
+    out = 1
+    inside = 1
+    for p, k in factorize(n).items():
+        out *= p**(k//2)
+        inside *= p**(k%2)
+    return out, inside
+
+
+# PRECOMPUTED TABLES
+#
+# build_tables.py saves the practice indexes (see POLYNOMIAL PRACTICE and QUADRATIC PRACTICE) as .npy files in the
+# tables folder. If they are there, they are memory-mapped when first used; if not, they are built then.
+
+tables_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables')
+
+
+def load_table(name):
+    # This function memory-maps tables/{name}.npy, or returns None if it has not been built
+    path = os.path.join(tables_dir, name + '.npy')
+    if os.path.exists(path):
+        return np.load(path, mmap_mode='r')
+    return None
+
+
+def as_fraction(value):
+    # This function turns a number into an exact Fraction. Ints and Fractions are already exact; a float
+    # (from the pages that still work in decimals) is snapped to the nearest fraction with a denominator up to a million,
+    # by continued fractions, so 0.3333333333333333 comes back as 1/3
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, (int, np.integer)):
+        return Fraction(int(value))
+    return Fraction(float(value)).limit_denominator(10**6)
+
+
+def combine_string(start):
+    
+    # takes in a string that might be something like "-2 + 3/4" (or a number), evaluates it exactly and turns it back
+    # into a fraction or mixed number if needed.
+    
+    if isinstance(start, str):
+        value = compile_exact(start)(0) # exact value of the string (it has no x, so the 0 is never used)
+        value = as_fraction(value).limit_denominator(10**6) # decimals typed out from floats, like 0.3333333333333333
+    else:
+        value = as_fraction(start)
+    numer = value.numerator
+    denom = value.denominator
+    
+    if denom!=1: # if it is actually a fraction
+        if numer<denom:
+            new_string = f'{numer}/{denom}' # fraction
+        else:
+            new_string = f'{numer//denom} {numer%denom}/{denom}' # improper fraction changed to a mixed number
+    else: # if it is a whole number
+        new_string = f'{numer}'
+    
+    return new_string
+
+   
+def simplify_radical(start):
+    # This function takes in a number from under a square root, and simplifes the radical
+    # for instance simplify_radical(20) --> 2,5,1, because sqrt(20) = 2 sqrt(5) / 1
+    # simplify_radical(8/5) --> 2,10,5, because sqrt(8/5) = sqrt(40/25) = 2 sqrt(10)/5
+    # start can be an int or a Fraction (exact), or a float (snapped to a fraction by as_fraction)
+    
+    start = as_fraction(start)
+    start_num = start.numerator
+    start_denom = start.denominator
+        
+    if math.isqrt(start_denom)**2 != start_denom: # make there be a perfect square in the denominator, to avoid radicals in the denominator
+        start_num = start_num*start_denom
+        start_denom = start_denom*start_denom
+
+    denom = math.isqrt(start_denom) # since the denominator is now a perfect square, take the square root
+    out_rad, in_rad = square_part(start_num) # take the largest perfect square factor of the numerator out of the radical
+    
+    ## SQRT({start}) = {out_rad}SQRT({in_rad})/{denom}
+    
+    out_rad, denom = simplify_fraction(out_rad,denom) # simplify the fraction outside the radical if needed
+    
+    return out_rad, in_rad, denom
+
+
+def simplify_fraction(n0, d0):
+    
+    # simplifies the fraction n0/d0, if possible, by dividing by the greatest common factor (Euclid's algorithm).
+    # The sign ends up on the numerator, and 0/d simplifies to 0/1.
+    
+    n0 = int(n0)
+    d0 = int(d0)
+    if d0 < 0:
+        n0 = -n0
+        d0 = -d0
+    gcf = math.gcd(n0, d0) # never 0, since d0 is not 0
+    n1 = n0//gcf
+    d1 = d0//gcf
+    
+    return n1, d1
+
+
+def simplify_fractions(nums, dens):
+    
+    # batch version of simplify_fraction: simplifies every nums[j]/dens[j] at once, for numpy arrays (or lists)
+    # of whole numbers, and returns two numpy arrays
+    
+    nums = np.asarray(nums, dtype=np.int64)
+    dens = np.asarray(dens, dtype=np.int64)
+    sign = np.where(dens < 0, -1, 1)
+    gcf = np.gcd(nums, dens)
+    gcf[gcf == 0] = 1 # only for 0/0, which is left alone
+    return sign*nums//gcf, sign*dens//gcf
+
+
+def quadratic_solutions(a, b, c):
+    # This function returns the exact solutions of ax^2 + bx + c = 0 (a not 0) as strings, by the quadratic formula:
+    # fractions when the discriminant is a perfect square, otherwise vertex +/- a simplified radical (with i when it is negative),
+    # for instance quadratic_solutions(1, -2, -1) --> ['1 + sqrt(2)', '1 - sqrt(2)']
+    vertex_x = Fraction(-b, 2*a)
+    disc = b*b - 4*a*c
+    if disc == 0:
+        return [f'{vertex_x}']
+    if (disc > 0) and (math.isqrt(disc)**2 == disc):
+        roots = sorted([vertex_x + Fraction(math.isqrt(disc), 2*abs(a)), vertex_x - Fraction(math.isqrt(disc), 2*abs(a))])
+        return [f'{r}' for r in roots]
+    out_rad, in_rad, denom = simplify_radical(Fraction(abs(disc), 4*a*a))
+    radical = ''
+    if out_rad != 1:
+        radical += f'{out_rad}'
+    if disc < 0:
+        radical += 'i'
+    if in_rad != 1:
+        radical = (radical + ' sqrt').lstrip() + f'({in_rad})'
+    if radical == '':
+        radical = '1'
+    if denom != 1:
+        radical += f'/{denom}'
+    if vertex_x == 0:
+        return [radical, f'-{radical}']
+    return [f'{vertex_x} + {radical}', f'{vertex_x} - {radical}']
+
+
+# POLYNOMIALS
+#
+# A Polynomial keeps its coefficients in one array, highest power first (like np.polyval), as exact Fractions,
+# so evaluating, dividing by (x - r) and deflating work the same way for any degree.
+
+
+class Polynomial:
+    # Polynomial in x with exact coefficients, e.g. Polynomial([2, 2, -2, -2]) is 2x^3 + 2x^2 - 2x - 2.
+    # Leading zeros are dropped, so the degree is always the real degree (the zero polynomial has degree 0).
+
+    def __init__(self, coefs):
+        coefs = [as_fraction(c) for c in coefs]
+        while len(coefs) > 1 and coefs[0] == 0:
+            coefs = coefs[1:]
+        if len(coefs) == 0:
+            coefs = [Fraction(0)]
+        self.coefs = np.array(coefs, dtype=object)
+        self.degree = len(coefs) - 1
+
+    def __call__(self, x):
+        # Horner's method; x can be a number or a numpy array of values
+        value = self.coefs[0]
+        for c in self.coefs[1:]:
+            value = value*x + c
+        return value
+
+    def __eq__(self, other):
+        return isinstance(other, Polynomial) and list(self.coefs) == list(other.coefs)
+
+    def __str__(self):
+        # written the way the app shows equations: 2x^3 + 2x^2 + -2x + -2
+        terms = []
+        for k, c in zip(range(self.degree, -1, -1), self.coefs):
+            if k > 1:
+                terms.append(f'{c}x^{k}')
+            elif k == 1:
+                terms.append(f'{c}x')
+            else:
+                terms.append(f'{c}')
+        return ' + '.join(terms)
+
+    def __repr__(self):
+        return f'Polynomial({[str(c) for c in self.coefs]})'
+
+    def synthetic_row(self, r):
+        # This function returns the bottom row of synthetic division by (x - r): the coefficients of the quotient,
+        # with the remainder (the value at r) as the last entry
+        r = as_fraction(r)
+        row = [self.coefs[0]]
+        for c in self.coefs[1:]:
+            row.append(c + row[-1]*r)
+        return row
+
+    def divide(self, r):
+        # This function divides by (x - r) and returns the quotient (a Polynomial) and the remainder
+        row = self.synthetic_row(r)
+        return Polynomial(row[:-1]), row[-1]
+
+    def deflate(self, r):
+        # This function divides out the root r (the remainder has to be 0) and returns the lower-degree Polynomial.
+        # For a fraction root n/d it divides by (dx - n) instead of (x - n/d), the same as dividing the quotient by d,
+        # so whole-number coefficients stay whole numbers.
+        quotient, remainder = self.divide(r)
+        if remainder != 0:
+            raise ValueError(f'{r} is not a root of {self}')
+        r = as_fraction(r)
+        if r.denominator != 1:
+            quotient = Polynomial(quotient.coefs / r.denominator)
+        return quotient
+
+
+def divisors(n):
+    # This function returns the positive divisors of a positive whole number, in increasing order (from its prime factorization)
+    divs = [1]
+    for p, e in factorize(n).items():
+        divs = [d*p**k for d in divs for k in range(e + 1)]
+    return sorted(divs)
+
+
+def rational_roots(coefs):
+    # This function returns every rational root of the polynomial with whole-number coefficients coefs
+    # (highest power first, like np.polyval), once each, as Fractions. By the rational root theorem every rational root
+    # is +/- p1/q1 for p1 a factor of the lowest nonzero coefficient and q1 a factor of the leading coefficient.
+    # Only reduced fractions are tried (gcd(p1, q1) == 1), so 2/2 is not tried again after 1/1, and all of them are
+    # checked at once by Horner's method on whole numbers: q1**n * f(p1/q1) = sum of c_k p1**k q1**(n-k) is exactly 0
+    # at a root, so no rounding is needed.
+    coefs = [int(c) for c in coefs]
+    while len(coefs) > 0 and coefs[0] == 0: # leading zeros do not change the polynomial
+        coefs = coefs[1:]
+    if len(coefs) == 0:
+        return []
+    zero_root = coefs[-1] == 0
+    while coefs[-1] == 0: # x = 0 is a root: divide out the powers of x
+        coefs = coefs[:-1]
+    p_list = divisors(abs(coefs[-1]))
+    q_list = divisors(abs(coefs[0]))
+    pairs = [(p1, q1) for q1 in q_list for p1 in p_list if math.gcd(p1, q1) == 1]
+    P = np.array([p1 for p1, q1 in pairs] + [-p1 for p1, q1 in pairs])
+    Q = np.array([q1 for p1, q1 in pairs] * 2)
+    n = len(coefs) - 1
+    # the int64 values are exact as long as the largest possible term fits; otherwise use python whole numbers
+    if sum(abs(c) for c in coefs) * max(p_list[-1], q_list[-1])**n >= 2**62:
+        P = P.astype(object)
+        Q = Q.astype(object)
+    value = np.full(len(P), coefs[0], dtype=P.dtype)
+    q_power = np.ones(len(P), dtype=P.dtype)
+    for c in coefs[1:]:
+        q_power = q_power*Q
+        value = value*P + c*q_power
+    roots = [Fraction(int(p1), int(q1)) for p1, q1 in zip(P[value == 0], Q[value == 0])]
+    if zero_root:
+        roots.append(Fraction(0))
+    return roots
+
+
+def rational_root_multiplicities(poly):
+    # This function divides every rational root out of poly (a Polynomial with whole-number coefficients) as many times
+    # as it goes in, e.g. x^3 + 3x^2 + 3x + 1 = (x + 1)^3 has the root -1 with multiplicity 3.
+    # It returns the list of (root, multiplicity) and the list of polynomials along the way: deflations[0] is poly, and
+    # deflations[k+1] is deflations[k] with the next root (repeats counted) divided out, so the last one has no rational roots left.
+    # The candidates are only searched once; after that each root is just divided out again until the remainder is not 0.
+    multiplicities = []
+    deflations = [poly]
+    for r in rational_roots(poly.coefs):
+        m = 0
+        while deflations[-1].degree > 0 and deflations[-1](r) == 0:
+            deflations.append(deflations[-1].deflate(r))
+            m += 1
+        multiplicities.append((r, m))
+    return multiplicities, deflations
+
+
+def classify_roots(roots, remainder, tolerance=1e-6):
+    # This function sorts all the roots of a polynomial into rational, irrational (real) and complex roots, given what
+    # rational_root_multiplicities found: roots, the exact rational roots (repeats listed again), and remainder, the last
+    # deflation, which has no rational roots left. Only the remainder is solved numerically (np.roots: the eigenvalues of
+    # the companion matrix). Returns (rational Fractions, real floats, complex numbers).
+    if remainder.degree > 0:
+        values = np.roots(remainder.coefs.astype(float))
+    else:
+        values = []
+    irrational = sorted(float(v.real) for v in values if abs(v.imag) <= tolerance*max(1, abs(v)))
+    complex_roots = sorted((complex(v) for v in values if abs(v.imag) > tolerance*max(1, abs(v))), key=lambda v: (v.real, v.imag))
+    return sorted(roots), irrational, complex_roots
+
+
+# POLYNOMIAL PRACTICE
+#
+# Solvable practice polynomials are built root first: (degree - 2) rational roots, each a factor (dx - n), times a
+# quadratic factor, so the equation always has enough rational roots to get down to a quadratic.
+# The index of every such polynomial with coefficients in the sidebar range is built with whole arrays of candidates at a
+# time, and saved by build_tables.py as tables/polynomials{degree}.npy (one row per polynomial: difficulty, then the
+# coefficients), which are checked in with the app. Difficulty 1 has whole-number roots only, difficulty 2 ends with
+# any quadratic (so its solutions can be fractions, square roots or complex numbers) and difficulty 3 also has fraction
+# roots to divide out.
+
+polynomial_difficulties = {1: 'Easy (whole-number roots)', 2: 'Medium (any quadratic at the end)', 3: 'Hard (fraction roots)'}
+
+
+def polynomial_from_roots(roots, factor=(1,)):
+    # This function multiplies the polynomial factor (coefficients, highest power first) by (dx - n) for every root n/d,
+    # e.g. polynomial_from_roots([2, Fraction(1,3)], (1, 0, 1)) is (x - 2)(3x - 1)(x^2 + 1)
+    coefs = [int(c) for c in factor]
+    for r in roots:
+        r = as_fraction(r)
+        coefs = [a*r.denominator - b*r.numerator for a, b in zip(coefs + [0], [0] + coefs)]
+    return Polynomial(coefs)
+
+
+def build_polynomial_index(degree, max_coef=40, max_root=6, max_denom=4):
+    # This function returns an array with one row per solvable polynomial of the given degree: its difficulty and then
+    # its degree + 1 coefficients, all within +/- max_coef. The roots n/d have |n| <= max_root and d <= max_denom, and the
+    # quadratic factors are ax^2 + bx + c with 1 <= a <= 3 and |b|, |c| <= max_root.
+    # A polynomial that can be made more than one way keeps its easiest difficulty.
+    linear = [(d, -n) for d in range(1, max_denom + 1) for n in range(-max_root, max_root + 1) if math.gcd(n, d) == 1]
+    linear = np.array(linear)
+    linear_level = np.where(linear[:, 0] == 1, 1, 3)
+    a, b, c = np.meshgrid(np.arange(1, 4), np.arange(-max_root, max_root + 1), np.arange(-max_root, max_root + 1), indexing='ij')
+    rows = np.stack([a.ravel(), b.ravel(), c.ravel()], axis=1)
+    # easy quadratics are x^2 + bx + c with whole-number roots: b*b - 4c is a perfect square (and a = 1)
+    disc = rows[:, 1]**2 - 4*rows[:, 2]
+    square = (disc >= 0) & (np.round(np.sqrt(np.abs(disc)))**2 == disc)
+    levels = np.where((rows[:, 0] == 1) & square, 1, 2)
+    for step in range(degree - 2):
+        # multiply every polynomial so far by every linear factor (dx - n) at once
+        rows = np.repeat(rows, len(linear), axis=0)
+        levels = np.maximum(np.repeat(levels, len(linear)), np.tile(linear_level, len(rows)//len(linear)))
+        d = np.tile(linear[:, 0], len(rows)//len(linear))[:, None]
+        m = np.tile(linear[:, 1], len(rows)//len(linear))[:, None]
+        zeros = np.zeros((len(rows), 1), dtype=rows.dtype)
+        rows = np.hstack([rows, zeros])*d + np.hstack([zeros, rows])*m
+        keep = np.all(np.abs(rows) <= max_coef, axis=1)
+        rows, levels = rows[keep], levels[keep]
+        # the same polynomial can come from different orders of the roots: keep one copy, at its easiest difficulty
+        order = np.argsort(levels, kind='stable')
+        rows, first = np.unique(rows[order], axis=0, return_index=True)
+        levels = levels[order][first]
+    return np.hstack([levels[:, None], rows]).astype(np.int8)
+
+
+@lru_cache(maxsize=8)
+def polynomial_index(degree):
+    # the index for one degree: from the tables folder if it has been built, otherwise built now (once per process)
+    table = load_table(f'polynomials{degree}')
+    if table is None:
+        table = build_polynomial_index(degree)
+    return table
+
+
+@lru_cache(maxsize=None)
+def polynomial_rows(degree, difficulty):
+    # the coefficients of the polynomials of one degree and difficulty, in a shuffled (but fixed) order -- worked out once
+    table = polynomial_index(degree)
+    rows = table[table[:, 0] == difficulty, 1:]
+    return rows[np.random.default_rng(degree*10 + difficulty).permutation(len(rows))]
+
+
+def solvable_polynomial(degree, difficulty, number):
+    # This function returns the coefficients of practice polynomial number 1, 2, 3, ... of the given degree and difficulty.
+    # The same number always gives the same polynomial, so it survives streamlit reruns; the numbers go through the
+    # index in a shuffled (but fixed) order, so consecutive numbers are not near-identical polynomials.
+    rows = polynomial_rows(degree, difficulty)
+    if len(rows) == 0:
+        return None
+    return [int(c) for c in rows[(number - 1) % len(rows)]]
+
+
+# EQUATION TEMPLATES
+#
+# The random linear practice equations are written as templates, the way they would be written on the board:
+# 'ax + b + c(dx + f) = gx + h' -- every letter other than x is a coefficient from 1 to 10 with a random sign.
+# A template is compiled once into the pieces to print and the products of coefficients that make up A and B in
+# (left - right) = Ax + B, so a whole batch of equations is sampled as numpy arrays and solved (x = -B/A) in one pass.
+
+equation_templates = {
+    # (x_on_both, distribution, combining): the forms it can take, each one equally likely
+    # (distribution and combining are 0, 1, 2: 0 = neither side, 1 = one side, 2 = both sides)
+    (0, 0, 0): ['ax + b = c', 'a = bx + c'],
+    (1, 0, 0): ['ax + b = cx + d'],
+    (1, 1, 0): ['a(bx + c) = dx + f', 'ax + b = c(dx + f)'],
+    (1, 2, 0): ['a(bx + c) = d(fx + g)'],
+    (1, 0, 1): ['ax + b = cx + d + fx + g', 'ax + b + cx + d = fx + g'],
+    (1, 1, 1): ['ax + b + c(dx + f) = gx + h', 'ax + b = cx + d + f(gx + h)', 'ax + b + cx + d = f(gx + h)', 'a(bx + c) = dx + f + gx + h'],
+    (1, 2, 1): ['ax + b + c(dx + f) = g(hx + j)', 'a(bx + c) = dx + f + g(hx + j)'],
+    (1, 0, 2): ['ax + b + cx + d = fx + g + hx + j'],
+    (1, 1, 2): ['ax + b + cx + d = fx + g + h(jx + k)', 'ax + b + c(dx + f) = gx + h + jx + k'],
+    (1, 2, 2): ['ax + b + c(dx + f) = gx + h + i(jx + k)'],
+}
+
+template_pattern = re.compile(r'\s*(?:([a-wyz])(x|\()?|([=)+]))')
+
+
+@lru_cache(maxsize=None)
+def compile_template(template):
+    # This function turns a template into (number of coefficients, pieces, x_terms, constant_terms):
+    # pieces is a list of (coefficient number, suffix, first) to print -- first means it starts a side or a parenthesis,
+    # so it is printed as '-3x' instead of ' - 3x' -- or (None, text, False) for '=' and ')'.
+    # x_terms and constant_terms are lists of (side, coefficient numbers) whose products add up to A and B.
+    pieces, x_terms, constant_terms = [], [], []
+    side = 1
+    first = True
+    outer = () # the coefficient in front of the parenthesis we are in, if any
+    letters = {}
+    for letter, suffix, symbol in template_pattern.findall(template):
+        if symbol == '=':
+            pieces.append((None, ' = ', False))
+            side = -1
+            first = True
+        elif symbol == ')':
+            pieces.append((None, ')', False))
+            outer = ()
+        elif letter:
+            n = letters.setdefault(letter, len(letters))
+            pieces.append((n, suffix, first))
+            if suffix == '(':
+                outer = (n,)
+                first = True
+                continue
+            elif suffix == 'x':
+                x_terms.append((side, outer + (n,)))
+            else:
+                constant_terms.append((side, outer + (n,)))
+            first = False
+    return len(letters), pieces, x_terms, constant_terms
+
+
+def render_equation(pieces, values):
+    # This function prints one equation from the compiled pieces and its (signed) coefficient values
+    equation = ''
+    for n, text, first in pieces:
+        if n is None:
+            equation += text
+        elif first:
+            equation += f'{values[n]}{text}'
+        elif values[n] < 0:
+            equation += f' - {-values[n]}{text}'
+        else:
+            equation += f' + {values[n]}{text}'
+    return equation
+
+
+def nice_solutions(A, B, max_denominator=None, max_solution=None):
+    # This function returns a mask of the equations Ax + B = 0 (A and B are arrays) that have exactly one solution
+    # x = -B/A, with a denominator (in lowest terms) up to max_denominator and a size up to max_solution
+    keep = A != 0
+    if max_denominator is not None:
+        keep &= np.abs(A) <= max_denominator*np.gcd(A, B) # the denominator is |A|/gcd(A, B)
+    if max_solution is not None:
+        keep &= np.abs(B) <= max_solution*np.abs(A)
+    return keep
+
+
+def generate_equations(x_on_both, distribution, combining, count=1, rng=None, max_denominator=None, max_solution=None):
+    # This function returns count random practice equations of the given type, as a list of (equation, solution) with the
+    # exact solution as a Fraction -- or None if the x terms cancel (no solution, or every x is a solution).
+    # rng is a numpy Generator; pass a seeded one to get the same equations again.
+    # With max_denominator (1 for whole-number answers) and/or max_solution, only equations with one solution that fits
+    # are kept: whole batches are drawn and checked at once, and drawn again until there are enough.
+    if rng is None:
+        rng = np.random.default_rng()
+    if x_on_both == 0:
+        distribution, combining = 0, 0
+    templates = equation_templates[(x_on_both, distribution, combining)]
+    limited = (max_denominator is not None) or (max_solution is not None)
+    results = []
+    for attempt in range(1000):
+        needed = count - len(results)
+        if needed <= 0:
+            return results
+        if limited:
+            size = max(4*needed, 100) # draw extra, since some will not fit
+        else:
+            size = needed
+        choice = rng.integers(len(templates), size=size)
+        batch = [None]*size
+        for t, template in enumerate(templates):
+            rows = np.nonzero(choice == t)[0]
+            if len(rows) == 0:
+                continue
+            letters, pieces, x_terms, constant_terms = compile_template(template)
+            values = rng.integers(1, 11, size=(len(rows), letters)) * rng.choice([-1, 1], size=(len(rows), letters))
+            A = sum(side*np.prod(values[:, list(terms)], axis=1) for side, terms in x_terms)
+            B = sum(side*np.prod(values[:, list(terms)], axis=1) for side, terms in constant_terms)
+            if limited:
+                keep = nice_solutions(A, B, max_denominator, max_solution)
+                rows, values, A, B = rows[keep], values[keep], A[keep], B[keep]
+            for row, v, a, b in zip(rows, values.tolist(), A.tolist(), B.tolist()):
+                if a == 0:
+                    solution = None
+                else:
+                    solution = Fraction(-b, a)
+                batch[row] = (render_equation(pieces, v), solution)
+        results += [r for r in batch if r is not None][:needed]
+    if len(results) < count:
+        raise ValueError('Could not find enough equations of this type with those limits on the solution')
+    return results
+
+
+@lru_cache(maxsize=1024)
+def practice_equation(seed, x_on_both, distribution, combining, max_denominator=None):
+    # This function returns the practice equation for a seed and the options, as (equation, solution). The same arguments
+    # always give the same equation (so it can be made again for grading), and it is cached, so a streamlit rerun just
+    # looks it up instead of drawing a new one.
+    rng = np.random.default_rng([seed, x_on_both, distribution, combining, max_denominator or 0])
+    return generate_equations(x_on_both, distribution, combining, 1, rng, max_denominator)[0]
+
+
+# QUADRATIC PRACTICE
+#
+# Every a, b, c the Standard form page can be given (a, b in -10..10 with a not 0, c in -20..20) is tagged once with the
+# methods that suit it, so a practice equation for a method is just a lookup instead of trial and error in the sidebar.
+# build_tables.py saves the index as tables/quadratics.npy (one row per equation: a, b, c, tags).
+
+quadratic_methods = {
+    'Factoring': 1,             # the factoring steps on the page work: a pair of numbers in -10..10 (after the GCF)
+    'Completing the square': 2, # b/a is even and c/a whole, so no fractions come up (even after dividing by a)
+    'Quadratic Formula': 4,     # it does not factor: the solutions are irrational or complex
+}
+
+
+def build_quadratic_index(max_a=10, max_b=10, max_c=20):
+    # This function returns an array with one row per equation ax^2 + bx + c = 0 in the ranges: a, b, c and the sum of the
+    # quadratic_methods tags that suit it
+    a, b, c = np.meshgrid(np.r_[-max_a:0, 1:max_a + 1], np.arange(-max_b, max_b + 1), np.arange(-max_c, max_c + 1), indexing='ij')
+    a, b, c = a.ravel(), b.ravel(), c.ravel()
+    # factor out the GCF the way the page does (negative when a is), then look for the pair adding to b1 and multiplying to a1*c1:
+    # they are (b1 +/- sqrt(disc))/2, so the discriminant has to be a perfect square and both numbers in the selectbox range
+    gcf = np.gcd(np.gcd(a, b), c) * np.sign(a)
+    a1, b1, c1 = a//gcf, b//gcf, c//gcf
+    disc = b1*b1 - 4*a1*c1
+    root = np.sqrt(np.maximum(disc, 0)).round().astype(a.dtype)
+    square = (disc >= 0) & (root*root == disc)
+    pair = square & (np.abs(b1 + root) <= 2*max_b) & (np.abs(b1 - root) <= 2*max_b)
+    factoring = (c == 0) | pair # c = 0 is factored with just a GCF
+    completing = (b % (2*a) == 0) & (c % a == 0) # the page ends up with (b/2a)^2 - c/a on the right
+    formula = ~square
+    tags = factoring*quadratic_methods['Factoring'] + completing*quadratic_methods['Completing the square'] + formula*quadratic_methods['Quadratic Formula']
+    return np.stack([a, b, c, tags], axis=1).astype(np.int8)
+
+
+@lru_cache(maxsize=None)
+def quadratic_rows(method):
+    # the rows of the index that suit a method, in a shuffled (but fixed) order -- worked out once per method
+    table = load_table('quadratics')
+    if table is None:
+        table = build_quadratic_index()
+    rows = table[(table[:, 3] & quadratic_methods[method]) != 0, :3]
+    return rows[np.random.default_rng(quadratic_methods[method]).permutation(len(rows))]
+
+
+def practice_quadratic(method, number):
+    # This function returns a, b, c for practice equation number 1, 2, 3, ... for a method; the same number always
+    # gives the same equation
+    rows = quadratic_rows(method)
+    a, b, c = rows[(number - 1) % len(rows)]
+    return int(a), int(b), int(c)
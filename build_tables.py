@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ### Offline build step for the practice indexes used by algebra_core
+#
+# usage:
+#   python build_tables.py
+#
+# Writes the index of solvable practice polynomials, tables/polynomials3.npy to tables/polynomials6.npy
+# (see POLYNOMIAL PRACTICE in algebra_core). These are small int8 files and are checked in, so a fresh deploy picks a
+# practice polynomial straight away -- rerun this and commit them after changing the polynomial ranges. (Without them
+# the index for a degree is built the first time it is used, which takes seconds for the higher degrees.)
+# The same goes for tables/quadratics.npy, the standard form equations tagged by solving method (QUADRATIC PRACTICE).
+
+# IMPORTS
+import argparse
+import os
+import numpy as np
+from algebra_core import build_polynomial_index, build_quadratic_index, tables_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompute the practice polynomial and quadratic indexes.')
+    parser.add_argument('--max-degree', type=int, default=6, help='build the polynomial index for degrees 3 up to this')
+    args = parser.parse_args(argv)
+
+    os.makedirs(tables_dir, exist_ok=True)
+    for degree in range(3, args.max_degree + 1):
+        np.save(os.path.join(tables_dir, f'polynomials{degree}.npy'), build_polynomial_index(degree))
+    np.save(os.path.join(tables_dir, 'quadratics.npy'), build_quadratic_index())
+    print(f'Tables written to {tables_dir}')
+
+
+if __name__ == '__main__':
+    main()
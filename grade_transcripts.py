@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ### Offline grader: checks whole files of student solutions (transcripts) without streamlit
+#
+# usage:
+#   python grade_transcripts.py submissions.jsonl -o results.jsonl
+#   python grade_transcripts.py submissions.csv --workers 8
+#
+# Each transcript is a starting equation plus the lines the student wrote after it:
+#   JSONL - one object per line: {"id": "...", "equation": "2(x + 3) = 10", "lines": ["2x + 6 = 10", "2x = 4", "x = 2"]}
+#   CSV   - a header row with "id", "equation" and "lines" columns; the lines are separated by ";"
+# The results are written as JSONL (to stdout unless -o is given), one object per transcript, in input order.
+# The input is read and graded in batches, so a file of any size only ever has one batch in memory.
+
+# IMPORTS
+import argparse
+import csv
+import json
+import os
+import sys
+from itertools import islice
+from multiprocessing import Pool
+from algebra_core import grade_transcript
+
+
+def read_transcripts(path, file_format):
+    # This function yields (id, equation, lines, error) for each transcript in the file, one at a time.
+    # A row that cannot be read (not JSON, no equation, or lines that are not a list of strings) comes through with equation None and the reason in error,
+    # so it is reported in the results instead of stopping the run.
+    with open(path, newline='') as f:
+        if file_format == 'csv':
+            for n, row in enumerate(csv.DictReader(f)):
+                if not row.get('equation'):
+                    yield row.get('id') or str(n), None, [], 'missing "equation"'
+                    continue
+                lines = [line for line in (row.get('lines') or '').split(';') if line.strip() != '']
+                yield row.get('id') or str(n), row['equation'], lines, None
+        else:
+            for n, row in enumerate(f):
+                if row.strip() == '':
+                    continue
+                try:
+                    record = json.loads(row)
+                except ValueError as e:
+                    yield str(n), None, [], f'not valid JSON: {e}'
+                    continue
+                if not isinstance(record, dict):
+                    yield str(n), None, [], 'not a JSON object'
+                    continue
+                if 'equation' not in record:
+                    yield record.get('id', str(n)), None, [], 'missing "equation"'
+                    continue
+                equation, lines = record['equation'], record.get('lines', [])
+                if not isinstance(equation, str):
+                    yield record.get('id', str(n)), None, [], '"equation" is not a string'
+                    continue
+                if not (isinstance(lines, list) and all(isinstance(line, str) for line in lines)):
+                    yield record.get('id', str(n)), equation, [], '"lines" is not a list of strings'
+                    continue
+                yield record.get('id', str(n)), equation, lines, None
+
+
+def grade_one(transcript):
+    # This function grades one transcript (runs in a worker process) and returns the result as a dictionary
+    transcript_id, equation, lines, error = transcript
+    result = {'id': transcript_id, 'equation': equation}
+    if error is not None: # the row could not be read
+        result['error'] = error
+        return result
+    try:
+        steps, solved, diagnosis = grade_transcript(equation, lines)
+    except Exception as e: # a broken submission should not stop the rest of the file from being graded
+        result['error'] = str(e)
+        return result
+    result['steps'] = [{'line': line, 'valid': bool(valid), 'solved': bool(step_solved), 'output': output}
+                       for line, (valid, step_solved, output) in zip(lines, steps)]
+    result['solved'] = bool(solved)
+    result['diagnosis'] = diagnosis
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Grade files of linear-equation solutions step by step.')
+    parser.add_argument('input', help='JSONL or CSV file of transcripts')
+    parser.add_argument('-o', '--output', help='where to write the JSONL results (default: stdout)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='input format (default: from the file extension)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='number of worker processes')
+    parser.add_argument('--batch-size', type=int, default=1000, help='transcripts read and graded at a time')
+    args = parser.parse_args(argv)
+
+    file_format = args.format
+    if file_format is None:
+        file_format = 'csv' if args.input.lower().endswith('.csv') else 'jsonl'
+
+    transcripts = read_transcripts(args.input, file_format)
+    out = open(args.output, 'w') if args.output else sys.stdout
+    graded = 0
+    try:
+        with Pool(args.workers) as pool:
+            while True:
+                batch = list(islice(transcripts, args.batch_size))
+                if len(batch) == 0:
+                    break
+                chunksize = max(1, len(batch) // (4*args.workers))
+                for result in pool.imap(grade_one, batch, chunksize):
+                    out.write(json.dumps(result) + '\n')
+                out.flush()
+                graded += len(batch)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f'Graded {graded} transcripts.', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
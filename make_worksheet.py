@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ### Worksheet builder: writes a worksheet of unique practice problems and its answer key, without streamlit
+#
+# usage:
+#   python make_worksheet.py linear 500 --level 1 2 1 -o linear.md
+#   python make_worksheet.py linear 500 --level 1 1 1 --max-denominator 1 --max-solution 10 -o whole_answers.md
+#   python make_worksheet.py quadratic 200 --form factored -o factoring.tex
+#   python make_worksheet.py polynomial 100 --degree 4 --difficulty 2 -o quartics.csv
+#
+# The format comes from the file extension (.csv, .tex or .md). The answer key goes next to the worksheet
+# (linear_key.md for linear.md) unless --key is given. Problems are generated, solved and written in batches, so only
+# a short fingerprint of each problem is kept in memory (to skip repeats), however long the worksheet is.
+
+# IMPORTS
+import argparse
+import csv
+import hashlib
+import os
+import re
+import sys
+import numpy as np
+from algebra_core import generate_equations, quadratic_solutions, solvable_polynomial
+from algebra_core import Polynomial, rational_root_multiplicities
+
+
+def tidy(text):
+    # written the way the app prints them, 1x^3 + -3x + 0x + 1, but a worksheet should say x^3 - 3x + 1
+    text = text.replace('+ -', '- ')
+    text = re.sub(r' [+-] 0(x(\^\d+)?)?(?=[ )]|$)', '', text) # 0 terms
+    return re.sub(r'(?<![\d/])1x', 'x', text) # 1x --> x, but not 11x or 1/1x
+
+
+def linear_key(equation):
+    # the template (the equation with every number written as n) and its signed coefficients, in order
+    signed = equation.replace(' - ', ' + -')
+    return re.sub(r'-?\d+', 'n', signed), tuple(int(v) for v in re.findall(r'-?\d+', signed))
+
+
+def linear_problems(args, rng):
+    # This function yields batches of (problem, answer, key) for linear equations of the chosen level
+    x_on_both, distribution, combining = args.level
+    while True:
+        batch = []
+        for equation, solution in generate_equations(x_on_both, distribution, combining, args.batch_size, rng,
+                                                     args.max_denominator, args.max_solution):
+            if solution is not None: # skip the ones where the x terms cancel
+                batch.append((tidy(equation), f'x = {solution}', linear_key(equation)))
+        yield batch
+
+
+def quadratic_problems(args, rng):
+    # This function yields batches of (problem, answer, key) for quadratic equations in the form chosen, with the
+    # coefficients in the same ranges as the sidebar of the quadratic pages (the key is the expanded a, b and c, so
+    # 2(x + 1)(x - 3) and 1(2x + 2)(x - 3) are the same problem)
+    size = args.batch_size
+    nonzero = np.r_[-10:0, 1:11]
+    while True:
+        if args.form == 'standard': # ax^2 + bx + c = 0
+            a = rng.choice(nonzero, size)
+            b = rng.integers(-10, 11, size)
+            c = rng.integers(-20, 21, size)
+            problems = [tidy(f'{a1}x^2 + {b1}x + {c1} = 0') for a1, b1, c1 in zip(a.tolist(), b.tolist(), c.tolist())]
+        elif args.form == 'factored': # a(bx + c)(dx + e) = 0
+            a, c, e = rng.choice(nonzero, size), rng.integers(-10, 11, size), rng.integers(-10, 11, size)
+            b, d = rng.integers(1, 11, size), rng.integers(1, 11, size)
+            problems = [tidy(f'{a1}({b1}x + {c1})({d1}x + {e1}) = 0')
+                        for a1, b1, c1, d1, e1 in zip(a.tolist(), b.tolist(), c.tolist(), d.tolist(), e.tolist())]
+            a, b, c = a*b*d, a*(b*e + c*d), a*c*e
+        else: # vertex form a(x - h)^2 + k = 0
+            a, h, k = rng.choice(nonzero, size), rng.integers(-10, 11, size), rng.integers(-10, 11, size)
+            problems = [tidy(f'{a1}(x - {h1})^2 + {k1} = 0').replace('- -', '+ ') for a1, h1, k1 in zip(a.tolist(), h.tolist(), k.tolist())]
+            a, b, c = a, -2*a*h, a*h*h + k
+        keys = list(zip(a.tolist(), b.tolist(), c.tolist()))
+        answers = ['x = ' + ', '.join(quadratic_solutions(a1, b1, c1)) for a1, b1, c1 in keys]
+        yield list(zip(problems, answers, keys))
+
+
+def polynomial_problems(args, rng):
+    # This function yields batches of (problem, answer, key) from the index of solvable polynomials: the rational roots
+    # (repeated ones listed again) and then whatever the quadratic left at the end gives; the key is the coefficients
+    number = int(rng.integers(1, 10**6))
+    while True:
+        batch = []
+        for n in range(number, number + args.batch_size):
+            poly = Polynomial(solvable_polynomial(args.degree, args.difficulty, n))
+            multiplicities, deflations = rational_root_multiplicities(poly)
+            solutions = [f'{r}' for r, m in multiplicities for copy in range(m)]
+            if deflations[-1].degree == 2:
+                solutions += quadratic_solutions(*[int(c) for c in deflations[-1].coefs])
+            batch.append((tidy(f'{poly} = 0'), 'x = ' + ', '.join(solutions), tuple(int(c) for c in poly.coefs)))
+        number += args.batch_size
+        yield batch
+
+
+def fingerprint(key):
+    # a short hash of a problem's key (a tuple of numbers and strings), so only 8 bytes per problem are kept
+    return hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+
+
+def latex_math(text):
+    # sqrt(5) --> \sqrt{5} for the .tex files
+    return re.sub(r'sqrt\((\d+)\)', r'\\sqrt{\1}', text)
+
+
+def write_start(f, file_format, title, column):
+    if file_format == 'csv':
+        csv.writer(f).writerow(['number', column])
+    elif file_format == 'tex':
+        f.write('\\documentclass{article}\n\\usepackage{amsmath}\n\\begin{document}\n')
+        f.write(f'\\section*{{{title}}}\n\\begin{{enumerate}}\n')
+    else:
+        f.write(f'# {title}\n\n')
+
+
+def write_item(f, file_format, number, text):
+    if file_format == 'csv':
+        csv.writer(f).writerow([number, text])
+    elif file_format == 'tex':
+        f.write(f'  \\item ${latex_math(text)}$\n')
+    else:
+        f.write(f'{number}. {text}\n')
+
+
+def write_end(f, file_format):
+    if file_format == 'tex':
+        f.write('\\end{enumerate}\n\\end{document}\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a worksheet of unique practice problems and its answer key.')
+    parser.add_argument('kind', choices=['linear', 'quadratic', 'polynomial'])
+    parser.add_argument('count', type=int, help='number of problems')
+    parser.add_argument('-o', '--output', required=True, help='worksheet file (.csv, .tex or .md)')
+    parser.add_argument('--key', help='answer key file (default: the worksheet name with _key added)')
+    parser.add_argument('--title', default='Practice Problems')
+    parser.add_argument('--level', type=int, nargs=3, default=[1, 0, 0], metavar=('X_ON_BOTH', 'DISTRIBUTION', 'COMBINING'),
+                        help='linear: x on both sides (0/1), distribution and combining (0 = neither side, 1 = one side, 2 = both sides)')
+    parser.add_argument('--max-denominator', type=int, help='linear: only answers with this denominator or less (1 = whole numbers)')
+    parser.add_argument('--max-solution', type=int, help='linear: only answers between -N and N')
+    parser.add_argument('--form', choices=['standard', 'factored', 'vertex'], default='standard', help='quadratic: form of the equation')
+    parser.add_argument('--degree', type=int, choices=[3, 4, 5, 6], default=3, help='polynomial: degree')
+    parser.add_argument('--difficulty', type=int, choices=[1, 2, 3], default=1, help='polynomial: 1 easy, 2 medium, 3 hard')
+    parser.add_argument('--seed', type=int, help='random seed, to get the same worksheet again')
+    parser.add_argument('--batch-size', type=int, default=500, help='problems generated and solved at a time')
+    args = parser.parse_args(argv)
+
+    stem, ext = os.path.splitext(args.output)
+    file_format = ext.lower().lstrip('.')
+    if file_format not in ['csv', 'tex', 'md']:
+        parser.error('the worksheet has to be a .csv, .tex or .md file')
+    key_path = args.key or f'{stem}_key{ext}'
+
+    rng = np.random.default_rng(args.seed)
+    problems = {'linear': linear_problems, 'quadratic': quadratic_problems, 'polynomial': polynomial_problems}[args.kind](args, rng)
+    seen = set()
+    written = 0
+    with open(args.output, 'w', newline='') as sheet, open(key_path, 'w', newline='') as key:
+        write_start(sheet, file_format, args.title, 'problem')
+        write_start(key, file_format, args.title + ' - Answer Key', 'answer')
+        while written < args.count:
+            new = 0
+            for problem, answer, problem_key in next(problems):
+                h = fingerprint(problem_key)
+                if h in seen:
+                    continue
+                seen.add(h)
+                new += 1
+                written += 1
+                write_item(sheet, file_format, written, problem)
+                write_item(key, file_format, written, answer)
+                if written == args.count:
+                    break
+            if new == 0: # a whole batch of repeats: there are no more different problems of this kind
+                print(f'Only {written} different problems of this kind could be made.', file=sys.stderr)
+                break
+        write_end(sheet, file_format)
+        write_end(key, file_format)
+    print(f'Wrote {written} problems to {args.output} and the answers to {key_path}.', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()